@@ -128,8 +128,9 @@ def encrypt(plaintext, key, nonce):
     return bytes(encrypted_message)
 
 
-# Exemple d'utilisation
-key = bytes([0] * 32)  
-nonce = bytes([0] * 8)  
-encrypted = encrypt(b'Votre message secret ici', key, nonce)
-print("Message chiffre:", encrypted)
\ No newline at end of file
+if __name__ == "__main__":
+    # Exemple d'utilisation
+    key = bytes([0] * 32)  
+    nonce = bytes([0] * 8)  
+    encrypted = encrypt(b'Votre message secret ici', key, nonce)
+    print("Message chiffre:", encrypted)
@@ -0,0 +1,127 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from chacha import key_expansion
+from chacha_numpy import BATCH_BLOCKS, BLOCK_SIZE, keystream_from_template
+
+# Taille minimale d'un morceau confié à un processus (multiple de 64 octets).
+MIN_CHUNK_SIZE = 1 << 20
+
+
+def _encrypt_range(source, destination, key, nonce, start, end):
+    """
+    Tâche exécutée par un processus de travail : chiffre les octets [start, end) de `source`
+    et les écrit directement dans la projection mémoire de `destination`. Seuls les chemins
+    et les positions transitent entre processus, jamais les données.
+
+    :param source: Chemin du fichier à chiffrer.
+    :param destination: Chemin du fichier de sortie (déjà à la bonne taille).
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 8 octets.
+    :param start: Début du morceau, aligné sur un bloc de 64 octets.
+    :param end: Fin du morceau (exclue).
+    :return: Le nombre d'octets traités.
+    """
+    template = key_expansion(key, nonce + bytes(4))
+    batch_size = BATCH_BLOCKS * BLOCK_SIZE
+    with open(source, 'rb') as fin, open(destination, 'r+b') as fout, \
+            mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as src, \
+            mmap.mmap(fout.fileno(), 0, access=mmap.ACCESS_WRITE) as dst:
+        for begin in range(start, end, batch_size):
+            size = min(batch_size, end - begin)
+            key_stream = keystream_from_template(template, begin // BLOCK_SIZE, (size + BLOCK_SIZE - 1) // BLOCK_SIZE)
+            data = np.frombuffer(src, dtype=np.uint8, count=size, offset=begin)
+            out = np.frombuffer(dst, dtype=np.uint8, count=size, offset=begin)
+            np.bitwise_xor(data, key_stream[:size], out=out)
+            # Les vues NumPy doivent être libérées avant la fermeture des projections.
+            del data, out
+        dst.flush()
+    return end - start
+
+
+def split_ranges(size, n_chunks):
+    """
+    Découpe [0, size) en au plus `n_chunks` intervalles alignés sur les blocs de 64 octets.
+
+    :param size: Taille totale en octets.
+    :param n_chunks: Nombre de morceaux souhaité.
+    :return: Liste de couples (début, fin).
+    """
+    chunk = max(MIN_CHUNK_SIZE, -(-size // max(1, n_chunks)))
+    chunk = -(-chunk // BLOCK_SIZE) * BLOCK_SIZE
+    return [(start, min(start + chunk, size)) for start in range(0, size, chunk)]
+
+
+def encrypt_file(source, destination, key, nonce, workers=None):
+    """
+    Chiffre (ou déchiffre) un fichier avec ChaCha20 en parallèle. Le mode compteur permettant de
+    calculer directement le flot de clés de n'importe quel bloc, le fichier est découpé en morceaux
+    alignés sur les blocs, chacun étant chiffré par un processus distinct qui lit et écrit les
+    fichiers par projection mémoire. Le résultat est identique à `encrypt` sur le contenu entier.
+
+    :param source: Chemin du fichier à chiffrer.
+    :param destination: Chemin du fichier de sortie.
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 8 octets.
+    :param workers: Nombre de processus (par défaut, le nombre de cœurs).
+    :return: Le nombre d'octets chiffrés.
+    :raises ValueError: Si `source` et `destination` désignent le même fichier.
+    """
+    assert len(key) == 32  # Vérification de la taille de la clé
+    assert len(nonce) == 8  # Vérification de la taille du nonce
+    # La destination est tronquée avant la lecture de la source : le même fichier serait perdu.
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise ValueError("La source et la destination doivent être des fichiers distincts.")
+    size = os.path.getsize(source)
+    with open(destination, 'wb') as f:
+        f.truncate(size)
+    if size == 0:
+        return 0
+
+    n_workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(size, 4 * n_workers)
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(_encrypt_range, source, destination, key, nonce, start, end) for start, end in ranges]
+        return sum(future.result() for future in futures)
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : chiffrement puis déchiffrement d'un fichier de 64 Mio.
+    import tempfile
+    import time
+    from chacha_numpy import encrypt_vectorized
+
+    key = os.urandom(32)
+    nonce = os.urandom(8)
+    with tempfile.TemporaryDirectory() as directory:
+        plain = os.path.join(directory, "clair.bin")
+        encrypted = os.path.join(directory, "chiffre.bin")
+        decrypted = os.path.join(directory, "dechiffre.bin")
+        with open(plain, 'wb') as f:
+            f.write(os.urandom(64 << 20))
+
+        start = time.perf_counter()
+        encrypt_file(plain, encrypted, key, nonce)
+        print(f"64 Mio chiffrés en {time.perf_counter() - start:.2f} s")
+        encrypt_file(encrypted, decrypted, key, nonce)
+
+        with open(plain, 'rb') as f:
+            content = f.read()
+        with open(encrypted, 'rb') as f:
+            assert f.read(1 << 20) == encrypt_vectorized(content[:1 << 20], key, nonce)
+        with open(decrypted, 'rb') as f:
+            assert f.read() == content
+        print("Déchiffrement correct")
+
+        # Le chiffrement sur place est refusé, et le fichier reste intact.
+        try:
+            encrypt_file(plain, plain, key, nonce)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Chiffrement sur place accepté")
+        with open(plain, 'rb') as f:
+            assert f.read() == content
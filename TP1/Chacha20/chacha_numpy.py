@@ -0,0 +1,142 @@
+import numpy as np
+
+from chacha import key_expansion
+
+BLOCK_SIZE = 64
+# Nombre de blocs calculés ensemble, pour borner la mémoire utilisée (256 Kio de flot par lot).
+BATCH_BLOCKS = 4096
+
+COLUMNS = ((0, 4, 8, 12), (1, 5, 9, 13), (2, 6, 10, 14), (3, 7, 11, 15))
+ROWS = ((0, 1, 2, 3), (4, 5, 6, 7), (8, 9, 10, 11), (12, 13, 14, 15))
+# Rounds diagonaux de ChaCha20 selon la RFC 8439 (utilisés à la place de ROWS par `chacha_poly1305`).
+DIAGONALS = ((0, 5, 10, 15), (1, 6, 11, 12), (2, 7, 8, 13), (3, 4, 9, 14))
+
+
+def _rotl(v, n):
+    """
+    Rotation à gauche de n bits d'un tableau de mots de 32 bits.
+    """
+    return (v << np.uint32(n)) | (v >> np.uint32(32 - n))
+
+
+def _quarter_round(x, a, b, c, d):
+    """
+    'Quarter Round' appliqué en place aux lignes a, b, c, d d'un tableau (16, n_blocs) :
+    les mêmes opérations que `quarter_round`, sur tous les blocs à la fois.
+    L'addition de NumPy sur uint32 est déjà modulo 2^32.
+    """
+    xa, xb, xc, xd = x[a], x[b], x[c], x[d]
+    xa += xb
+    xd ^= xa
+    xd[:] = _rotl(xd, 16)
+    xc += xd
+    xb ^= xc
+    xb[:] = _rotl(xb, 12)
+    xa += xb
+    xd ^= xa
+    xd[:] = _rotl(xd, 8)
+    xc += xd
+    xb ^= xc
+    xb[:] = _rotl(xb, 7)
+
+
+def chacha_blocks(key, nonce, first_block, n_blocks):
+    """
+    Calcule d'un coup `n_blocks` blocs de flot de clés consécutifs, tels que les produit `encrypt`.
+
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 8 octets.
+    :param first_block: Numéro du premier bloc (compteur).
+    :param n_blocks: Nombre de blocs.
+    :return: Le flot de clés, sous forme de tableau uint8 de `64 * n_blocks` octets.
+    """
+    assert len(nonce) == 8  # Vérification de la taille du nonce
+    return keystream_from_template(key_expansion(key, nonce + bytes(4)), first_block, n_blocks)
+
+
+def keystream_from_template(template, first_block, n_blocks, counter_word=15, second_round=ROWS):
+    """
+    Calcule `n_blocks` blocs de flot de clés à partir d'un état initial déjà préparé,
+    le mot `counter_word` (compteur de blocs) étant remplacé par le numéro de chaque bloc.
+
+    L'état est un tableau uint32 (16, n_blocks) : chaque colonne est l'état d'un bloc, et les
+    10 'Double Rounds' sont appliqués à toutes les colonnes en même temps.
+
+    :param template: État initial de 16 mots de 32 bits (résultat de `key_expansion`).
+    :param first_block: Numéro du premier bloc.
+    :param n_blocks: Nombre de blocs.
+    :param counter_word: Position du compteur de blocs dans l'état (15 pour `encrypt`, 12 pour la RFC 8439).
+    :param second_round: Second round de chaque 'Double Round' (ROWS pour `encrypt`, DIAGONALS pour la RFC 8439).
+    :return: Le flot de clés, sous forme de tableau uint8 de `64 * n_blocks` octets.
+    """
+    if first_block + n_blocks > 1 << 32:
+        raise OverflowError("Le compteur de blocs est limité à 32 bits.")
+    x = np.repeat(np.array(template, dtype=np.uint32)[:, None], n_blocks, axis=1)
+    x[counter_word] = np.arange(first_block, first_block + n_blocks, dtype=np.uint32)
+    original_x = x.copy()
+
+    for _ in range(10):
+        for indices in COLUMNS:
+            _quarter_round(x, *indices)
+        for indices in second_round:
+            _quarter_round(x, *indices)
+    x += original_x  # Addition finale modulo 2^32
+
+    # Chaque bloc est la suite de ses 16 mots en petit-boutiste.
+    return np.ascontiguousarray(x.T, dtype='<u4').view(np.uint8).reshape(-1)
+
+
+def xor_keystream(data, key, nonce, first_block=0):
+    """
+    Applique le flot de clés à un message entier (chiffrement ou déchiffrement), par lots de blocs,
+    le XOR étant fait sur tout le tampon avec `np.bitwise_xor`.
+
+    :param data: Message sous forme d'octets.
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 8 octets.
+    :param first_block: Numéro du bloc correspondant au premier octet de `data`.
+    :return: Le résultat sous forme de `bytes`.
+    """
+    data = np.frombuffer(bytes(data), dtype=np.uint8)
+    out = np.empty_like(data)
+    n_blocks = (data.size + BLOCK_SIZE - 1) // BLOCK_SIZE
+    for start in range(0, n_blocks, BATCH_BLOCKS):
+        count = min(BATCH_BLOCKS, n_blocks - start)
+        begin = start * BLOCK_SIZE
+        end = min(begin + count * BLOCK_SIZE, data.size)
+        key_stream = chacha_blocks(key, nonce, first_block + start, count)
+        np.bitwise_xor(data[begin:end], key_stream[:end - begin], out=out[begin:end])
+    return out.tobytes()
+
+
+def encrypt_vectorized(plaintext, key, nonce):
+    """
+    Équivalent de `encrypt(plaintext, key, nonce)`, le flot de clés étant calculé par lots de blocs.
+
+    :param plaintext: Message en clair sous forme d'octets.
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 8 octets.
+    :return: Message chiffré sous forme d'octets.
+    """
+    return xor_keystream(plaintext, key, nonce)
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation et comparaison avec `encrypt`.
+    import os
+    import time
+    from chacha import encrypt
+
+    key = bytes([0] * 32)
+    nonce = bytes([0] * 8)
+    message = b'Votre message secret ici'
+    assert encrypt_vectorized(message, key, nonce) == encrypt(message, key, nonce)
+    print("Message chiffre:", encrypt_vectorized(message, key, nonce))
+
+    message = os.urandom(1 << 16)
+    start = time.perf_counter()
+    reference = encrypt(message, key, nonce)
+    reference_time = time.perf_counter() - start
+    start = time.perf_counter()
+    assert encrypt_vectorized(message, key, nonce) == reference
+    print(f"64 Kio : encrypt {reference_time:.3f} s, encrypt_vectorized {time.perf_counter() - start:.4f} s")
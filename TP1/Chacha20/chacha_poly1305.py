@@ -0,0 +1,293 @@
+import hmac
+from array import array
+
+from chacha import quarter_round
+from chacha_numpy import DIAGONALS, keystream_from_template
+from chacha_stream import ChaCha20Cipher
+
+SIGMA = [0x61707865, 0x3320646e, 0x79622d32, 0x6b206574]  # Constantes 'expand 32-byte k'
+P1305 = (1 << 130) - 5
+TAG_SIZE = 16
+
+
+def rfc_state(key, counter, nonce):
+    """
+    État initial de ChaCha20 selon la RFC 8439 : constantes, clé, compteur de bloc (mot 12)
+    puis nonce de 96 bits (mots 13 à 15).
+
+    :param key: Clé de 32 octets.
+    :param counter: Compteur de bloc sur 32 bits.
+    :param nonce: Nonce de 12 octets.
+    :return: Liste de 16 mots de 32 bits.
+    """
+    assert len(key) == 32  # Vérification de la taille de la clé
+    assert len(nonce) == 12  # Vérification de la taille du nonce
+    key_words = [int.from_bytes(key[i:i+4], 'little') for i in range(0, 32, 4)]
+    nonce_words = [int.from_bytes(nonce[i:i+4], 'little') for i in range(0, 12, 4)]
+    return SIGMA + key_words + [counter] + nonce_words
+
+
+def chacha20_block(key, counter, nonce):
+    """
+    Fonction de bloc ChaCha20 de la RFC 8439 : 10 'Double Rounds' formés d'un round sur les
+    colonnes et d'un round sur les diagonales, construits sur `quarter_round`.
+
+    :param key: Clé de 32 octets.
+    :param counter: Compteur de bloc.
+    :param nonce: Nonce de 12 octets.
+    :return: Le bloc de 64 octets de flot de clés.
+    """
+    x = rfc_state(key, counter, nonce)
+    original_x = x[:]
+    for _ in range(10):
+        x[0], x[4], x[8], x[12] = quarter_round(x[0], x[4], x[8], x[12])
+        x[1], x[5], x[9], x[13] = quarter_round(x[1], x[5], x[9], x[13])
+        x[2], x[6], x[10], x[14] = quarter_round(x[2], x[6], x[10], x[14])
+        x[3], x[7], x[11], x[15] = quarter_round(x[3], x[7], x[11], x[15])
+        x[0], x[5], x[10], x[15] = quarter_round(x[0], x[5], x[10], x[15])
+        x[1], x[6], x[11], x[12] = quarter_round(x[1], x[6], x[11], x[12])
+        x[2], x[7], x[8], x[13] = quarter_round(x[2], x[7], x[8], x[13])
+        x[3], x[4], x[9], x[14] = quarter_round(x[3], x[4], x[9], x[14])
+    return b''.join(((xi + oi) & 0xffffffff).to_bytes(4, 'little') for xi, oi in zip(x, original_x))
+
+
+class RFC8439Cipher(ChaCha20Cipher):
+    """
+    Contexte de chiffrement ChaCha20 conforme à la RFC 8439 (nonce de 12 octets, compteur au mot 12,
+    rounds diagonaux), avec la même interface `update`/`seek` que `ChaCha20Cipher`.
+    """
+
+    __slots__ = ("first_counter",)
+
+    def __init__(self, key, nonce, first_counter=1):
+        """
+        :param key: Clé de 32 octets.
+        :param nonce: Nonce de 12 octets.
+        :param first_counter: Compteur du premier bloc (1 pour l'AEAD, le bloc 0 servant à la clé Poly1305).
+        """
+        self.template = array('I', rfc_state(key, 0, nonce))
+        self.first_counter = first_counter
+        self.position = 0
+        self._pending = b''
+
+    def _blocks(self, block, count):
+        return keystream_from_template(self.template, self.first_counter + block, count,
+                                       counter_word=12, second_round=DIAGONALS)
+
+
+class Poly1305:
+    """
+    Code d'authentification Poly1305 (RFC 8439, 2.5), calculé au fil de l'eau sur des blocs de 16 octets
+    avec l'arithmétique des grands entiers de Python.
+    """
+
+    __slots__ = ("r", "s", "accumulator", "_buffer")
+
+    def __init__(self, key):
+        """
+        :param key: Clé à usage unique de 32 octets (r puis s).
+        """
+        assert len(key) == 32  # Vérification de la taille de la clé
+        self.r = int.from_bytes(key[:16], 'little') & 0x0ffffffc0ffffffc0ffffffc0fffffff
+        self.s = int.from_bytes(key[16:], 'little')
+        self.accumulator = 0
+        self._buffer = b''
+
+    def update(self, data):
+        """
+        Ajoute des données au message authentifié. Les blocs complets sont traités immédiatement,
+        seul un reste de moins de 16 octets est conservé.
+
+        :param data: Octets à ajouter.
+        """
+        if self._buffer:
+            data = self._buffer + bytes(data)
+        view = memoryview(data)
+        full = len(view) - len(view) % 16
+        r = self.r
+        acc = self.accumulator
+        from_bytes = int.from_bytes
+        high_bit = 1 << 128
+        for i in range(0, full, 16):
+            acc = (acc + (from_bytes(view[i:i + 16], 'little') | high_bit)) * r % P1305
+        self.accumulator = acc
+        self._buffer = bytes(view[full:])
+
+    def pad16(self):
+        """
+        Complète le message par des zéros jusqu'à un multiple de 16 octets (construction AEAD).
+        """
+        if self._buffer:
+            self.update(bytes(16 - len(self._buffer)))
+
+    def digest(self):
+        """
+        :return: L'étiquette de 16 octets du message ajouté jusqu'ici.
+        """
+        acc = self.accumulator
+        if self._buffer:
+            block = int.from_bytes(self._buffer, 'little') | (1 << (8 * len(self._buffer)))
+            acc = (acc + block) * self.r % P1305
+        return ((acc + self.s) & ((1 << 128) - 1)).to_bytes(16, 'little')
+
+
+class _AEADContext:
+    """
+    Partie commune au chiffrement et au déchiffrement ChaCha20-Poly1305 : la clé Poly1305 est le
+    début du bloc 0, les données associées sont authentifiées d'abord, puis le chiffré au fur et
+    à mesure qu'il est produit ou reçu, si bien que les données ne sont parcourues qu'une fois.
+    """
+
+    def __init__(self, key, nonce, aad=b''):
+        """
+        :param key: Clé de 32 octets.
+        :param nonce: Nonce de 12 octets (à ne jamais réutiliser avec la même clé).
+        :param aad: Données associées, authentifiées mais non chiffrées.
+        """
+        self.cipher = RFC8439Cipher(key, nonce)
+        self.mac = Poly1305(chacha20_block(key, 0, nonce)[:32])
+        self.mac.update(aad)
+        self.mac.pad16()
+        self.aad_length = len(aad)
+        self.length = 0
+        self.tag = None  # Étiquette, calculée une seule fois par `finalize`.
+
+    def _check_open(self):
+        """
+        :raises ValueError: Si `finalize` a déjà été appelée.
+        """
+        if self.tag is not None:
+            raise ValueError("Contexte déjà finalisé.")
+
+    def _tag(self):
+        """
+        Termine l'authentification (complément et bloc des longueurs) et conserve l'étiquette :
+        appelée une seconde fois, elle renvoie la même étiquette sans rien ajouter à l'authentifiant.
+
+        :return: L'étiquette calculée sur les données associées et le chiffré traités.
+        """
+        if self.tag is not None:
+            return self.tag
+        self.mac.pad16()
+        self.mac.update(self.aad_length.to_bytes(8, 'little') + self.length.to_bytes(8, 'little'))
+        self.tag = self.mac.digest()
+        return self.tag
+
+
+class ChaCha20Poly1305Encryptor(_AEADContext):
+    """
+    Chiffrement authentifié ChaCha20-Poly1305 en flot : `update` renvoie le chiffré de chaque
+    morceau et met à jour l'authentifiant, `finalize` renvoie l'étiquette.
+    """
+
+    def update(self, chunk):
+        """
+        :param chunk: Morceau de texte clair.
+        :return: Le chiffré correspondant.
+        """
+        self._check_open()
+        ciphertext = self.cipher.update(chunk)
+        self.mac.update(ciphertext)
+        self.length += len(ciphertext)
+        return ciphertext
+
+    def finalize(self):
+        """
+        :return: L'étiquette d'authentification de 16 octets.
+        :raises ValueError: Si le contexte est déjà finalisé.
+        """
+        self._check_open()
+        return self._tag()
+
+
+class ChaCha20Poly1305Decryptor(_AEADContext):
+    """
+    Déchiffrement authentifié ChaCha20-Poly1305 en flot. Le texte clair renvoyé par `update`
+    ne doit pas être utilisé tant que `finalize` n'a pas vérifié l'étiquette.
+    """
+
+    def update(self, chunk):
+        """
+        :param chunk: Morceau de chiffré.
+        :return: Le texte clair correspondant (non authentifié avant `finalize`).
+        """
+        self._check_open()
+        self.mac.update(chunk)
+        self.length += len(chunk)
+        return self.cipher.update(chunk)
+
+    def finalize(self, tag):
+        """
+        Vérifie l'étiquette, en temps constant.
+
+        :param tag: Étiquette de 16 octets reçue.
+        :raises ValueError: Si l'étiquette est invalide ou si le contexte est déjà finalisé.
+        """
+        self._check_open()
+        if not hmac.compare_digest(self._tag(), bytes(tag)):
+            raise ValueError("Étiquette d'authentification invalide.")
+
+
+def aead_encrypt(plaintext, key, nonce, aad=b''):
+    """
+    Chiffre et authentifie un message avec ChaCha20-Poly1305 (RFC 8439, 2.8).
+
+    :param plaintext: Message en clair.
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 12 octets.
+    :param aad: Données associées.
+    :return: Le chiffré suivi de l'étiquette de 16 octets.
+    """
+    encryptor = ChaCha20Poly1305Encryptor(key, nonce, aad)
+    return encryptor.update(plaintext) + encryptor.finalize()
+
+
+def aead_decrypt(ciphertext, key, nonce, aad=b''):
+    """
+    Vérifie et déchiffre un message produit par `aead_encrypt`.
+
+    :param ciphertext: Chiffré suivi de l'étiquette.
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 12 octets.
+    :param aad: Données associées.
+    :return: Le message en clair.
+    """
+    if len(ciphertext) < TAG_SIZE:
+        raise ValueError("Message trop court.")
+    decryptor = ChaCha20Poly1305Decryptor(key, nonce, aad)
+    plaintext = decryptor.update(ciphertext[:-TAG_SIZE])
+    decryptor.finalize(ciphertext[-TAG_SIZE:])
+    return plaintext
+
+
+if __name__ == "__main__":
+    # Vecteurs de test de la RFC 8439 (2.5.2 et 2.8.2).
+    mac = Poly1305(bytes.fromhex("85d6be7857556d337f4452fe42d506a80103808afb0db2fd4abff6af4149f51b"))
+    mac.update(b"Cryptographic Forum Research Group")
+    assert mac.digest().hex() == "a8061dc1305136c6c22b8baf0c0127a9"
+
+    key = bytes(range(0x80, 0xa0))
+    nonce = bytes.fromhex("070000004041424344454647")
+    aad = bytes.fromhex("50515253c0c1c2c3c4c5c6c7")
+    plaintext = (b"Ladies and Gentlemen of the class of '99: If I could offer you only one tip "
+                 b"for the future, sunscreen would be it.")
+    sealed = aead_encrypt(plaintext, key, nonce, aad)
+    assert sealed[:16].hex() == "d31a8d34648e60db7b86afbc53ef7ec2"
+    assert sealed[-16:].hex() == "1ae10b594f09e26a7e902ecbd0600691"
+    assert aead_decrypt(sealed, key, nonce, aad) == plaintext
+    print("Tag:", sealed[-16:].hex())
+
+    # Mode flot : morceaux de tailles quelconques, une seule passe sur les données.
+    encryptor = ChaCha20Poly1305Encryptor(key, nonce, aad)
+    pieces = [encryptor.update(plaintext[i:i + 7]) for i in range(0, len(plaintext), 7)]
+    assert b''.join(pieces) + encryptor.finalize() == sealed
+
+    # Après `finalize`, l'étiquette reste disponible et le contexte refuse toute nouvelle donnée.
+    assert encryptor.tag == sealed[-16:]
+    for call in (lambda: encryptor.update(b"x"), encryptor.finalize):
+        try:
+            call()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Contexte finalisé réutilisé")
@@ -0,0 +1,259 @@
+import threading
+import time
+from collections import deque
+
+from chacha import key_expansion
+from chacha_numpy import BLOCK_SIZE, keystream_from_template
+
+# Nombre maximal de blocs du compteur de 32 bits.
+MAX_BLOCKS = 1 << 32
+
+
+class PrefetchedStream:
+    """
+    Flot de clés ChaCha20 d'un couple (clé, nonce), calculé à l'avance par un thread de travail
+    dans un tampon borné. Les octets du flot sont distribués dans l'ordre : un consommateur réserve
+    sa position et sa longueur dès l'entrée dans `take`, sous un verrou tenu jusqu'à la remise des
+    octets, si bien que chaque position du flot n'est remise qu'une seule fois et toujours avec la
+    position annoncée, même avec plusieurs threads consommateurs.
+
+    Statistiques : `hits` (demande servie directement depuis le tampon), `misses` (tampon
+    insuffisant, le consommateur attend le producteur), `stall_time` (temps total d'attente des
+    consommateurs, en secondes) et `producer_waits` (tampon plein, le producteur attend).
+    """
+
+    __slots__ = ("template", "capacity", "batch_blocks", "position", "next_block", "hits", "misses",
+                 "stall_time", "producer_waits", "_chunks", "_available", "_closed", "_condition", "_take_lock", "_thread")
+
+    def __init__(self, key, nonce, buffer_blocks=1024, batch_blocks=16):
+        """
+        :param key: Clé de 32 octets.
+        :param nonce: Nonce de 8 octets.
+        :param buffer_blocks: Taille du tampon, en blocs de 64 octets.
+        :param batch_blocks: Nombre de blocs calculés à chaque passage du producteur.
+        """
+        assert len(key) == 32  # Vérification de la taille de la clé
+        assert len(nonce) == 8  # Vérification de la taille du nonce
+        if not 0 < batch_blocks <= buffer_blocks:
+            raise ValueError("Il faut 0 < batch_blocks <= buffer_blocks.")
+        self.template = key_expansion(key, nonce + bytes(4))
+        self.capacity = buffer_blocks * BLOCK_SIZE
+        self.batch_blocks = batch_blocks
+        self.position = 0        # Prochain octet du flot à remettre.
+        self.next_block = 0      # Prochain bloc à calculer (modifié par le producteur seulement).
+        self.hits = 0
+        self.misses = 0
+        self.stall_time = 0.0
+        self.producer_waits = 0
+        self._chunks = deque()   # Flot de clés calculé et pas encore remis (memoryviews).
+        self._available = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._take_lock = threading.Lock()  # Un seul consommateur à la fois, du début à la fin de `take`.
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _produce(self):
+        """
+        Boucle du thread de travail : remplit le tampon tant qu'il reste de la place.
+        """
+        condition = self._condition
+        batch_size = self.batch_blocks * BLOCK_SIZE
+        while True:
+            with condition:
+                while not self._closed and self._available + batch_size > self.capacity:
+                    self.producer_waits += 1
+                    condition.wait()
+                count = min(self.batch_blocks, MAX_BLOCKS - self.next_block)
+                if self._closed or count == 0:
+                    condition.notify_all()
+                    return
+            # Calcul hors du verrou : les consommateurs continuent à être servis pendant ce temps.
+            blocks = keystream_from_template(self.template, self.next_block, count).tobytes()
+            with condition:
+                self._chunks.append(memoryview(blocks))
+                self._available += len(blocks)
+                self.next_block += count
+                condition.notify_all()
+
+    def take(self, n_bytes):
+        """
+        Réserve les `n_bytes` prochains octets du flot de clés.
+
+        :param n_bytes: Nombre d'octets.
+        :return: Un couple (position du premier octet dans le flot, flot de clés en `bytes`).
+        """
+        with self._take_lock, self._condition:
+            if self._closed:
+                raise ValueError("Flot fermé.")
+            remaining = self._available + (MAX_BLOCKS - self.next_block) * BLOCK_SIZE
+            if n_bytes > remaining:
+                raise OverflowError("Le compteur de blocs est limité à 32 bits.")
+            # Réservation de la portion du flot avant toute attente du producteur.
+            position = self.position
+            self.position += n_bytes
+            hit = self._available >= n_bytes
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                start = time.perf_counter()
+            parts = []
+            needed = n_bytes
+            while needed:
+                while not self._chunks:
+                    if self._closed:
+                        raise ValueError("Flot fermé.")
+                    self._condition.wait()
+                chunk = self._chunks[0]
+                if len(chunk) <= needed:
+                    parts.append(self._chunks.popleft())
+                    needed -= len(chunk)
+                else:
+                    parts.append(chunk[:needed])
+                    self._chunks[0] = chunk[needed:]
+                    needed = 0
+                self._available -= len(parts[-1])
+                self._condition.notify_all()
+            if not hit:
+                self.stall_time += time.perf_counter() - start
+        return position, b''.join(parts)
+
+    def encrypt(self, payload):
+        """
+        Chiffre un message avec la portion suivante du flot de clés.
+
+        :param payload: Message en clair sous forme d'octets.
+        :return: Un couple (position dans le flot, chiffré). Le déchiffrement se fait en se
+                 plaçant à cette position (par exemple avec `ChaCha20Cipher.seek`).
+        """
+        position, key_stream = self.take(len(payload))
+        value = int.from_bytes(payload, 'little') ^ int.from_bytes(key_stream, 'little')
+        return position, value.to_bytes(len(payload), 'little')
+
+    def stats(self):
+        """
+        :return: Dictionnaire des statistiques du flot, pour dimensionner le tampon.
+        """
+        with self._condition:
+            return {"hits": self.hits, "misses": self.misses, "stall_time": self.stall_time,
+                    "producer_waits": self.producer_waits, "buffered": self._available,
+                    "position": self.position}
+
+    def close(self):
+        """
+        Arrête le thread de travail. Le flot de clés restant dans le tampon est abandonné.
+        """
+        with self._condition:
+            self._closed = True
+            self._chunks.clear()
+            self._available = 0
+            self._condition.notify_all()
+        self._thread.join()
+
+
+class KeystreamPool:
+    """
+    Ensemble de flots préchargés, un par couple (clé, nonce) enregistré. Un même couple ne peut
+    être enregistré qu'une fois dans la vie du pool, pour ne jamais recommencer un flot au bloc 0.
+    """
+
+    def __init__(self, buffer_blocks=1024, batch_blocks=16):
+        """
+        :param buffer_blocks: Taille du tampon de chaque flot, en blocs de 64 octets.
+        :param batch_blocks: Nombre de blocs calculés à chaque passage du producteur.
+        """
+        self.buffer_blocks = buffer_blocks
+        self.batch_blocks = batch_blocks
+        self.streams = {}
+        self._used = set()
+        self._lock = threading.Lock()
+
+    def register(self, key, nonce):
+        """
+        :param key: Clé de 32 octets.
+        :param nonce: Nonce de 8 octets.
+        :return: Le `PrefetchedStream` du couple (clé, nonce).
+        """
+        ident = (bytes(key), bytes(nonce))
+        with self._lock:
+            if ident in self._used:
+                raise ValueError("Ce couple (clé, nonce) a déjà été enregistré.")
+            self._used.add(ident)
+            stream = PrefetchedStream(key, nonce, self.buffer_blocks, self.batch_blocks)
+            self.streams[ident] = stream
+        return stream
+
+    def stats(self):
+        """
+        :return: Les statistiques cumulées de tous les flots.
+        """
+        total = {"hits": 0, "misses": 0, "stall_time": 0.0, "producer_waits": 0, "buffered": 0}
+        for stream in list(self.streams.values()):
+            for name, value in stream.stats().items():
+                if name in total:
+                    total[name] += value
+        return total
+
+    def close(self):
+        """
+        Arrête tous les threads de travail.
+        """
+        with self._lock:
+            streams, self.streams = self.streams, {}
+        for stream in streams.values():
+            stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : chiffrement de nombreux petits messages.
+    import os
+    from chacha import encrypt
+    from chacha_stream import ChaCha20Cipher
+
+    key = os.urandom(32)
+    nonce = os.urandom(8)
+    messages = [os.urandom(size) for size in (40, 100, 7, 300, 64) * 200]
+
+    with KeystreamPool(buffer_blocks=256) as pool:
+        stream = pool.register(key, nonce)
+        time.sleep(0.05)  # Laisse le producteur remplir le tampon.
+        start = time.perf_counter()
+        sealed = [stream.encrypt(message) for message in messages]
+        elapsed = time.perf_counter() - start
+        print(f"{len(messages)} messages chiffrés en {elapsed:.4f} s ;", pool.stats())
+
+    # Chaque message se déchiffre en se plaçant à sa position dans le flot.
+    cipher = ChaCha20Cipher(key, nonce)
+    for message, (position, ciphertext) in zip(messages, sealed):
+        cipher.seek(position)
+        assert cipher.update(ciphertext) == message
+    assert b''.join(c for _, c in sealed) == encrypt(b''.join(messages), key, nonce)
+    print("Aucun octet du flot remis deux fois, déchiffrement correct")
+
+    # Plusieurs threads consommateurs sur un petit tampon : les attentes du producteur sont fréquentes,
+    # et chaque chiffré doit pourtant se déchiffrer à la position qui lui a été remise.
+    results = [[] for _ in range(4)]
+    stream = PrefetchedStream(key, nonce, buffer_blocks=2, batch_blocks=1)
+
+    def worker(out):
+        for message in messages[:200]:
+            out.append((message, stream.encrypt(message)))
+
+    threads = [threading.Thread(target=worker, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stream.close()
+    for out in results:
+        for message, (position, ciphertext) in out:
+            cipher.seek(position)
+            assert cipher.update(ciphertext) == message
+    print("4 threads :", stream.stats())
@@ -0,0 +1,148 @@
+from array import array
+
+import numpy as np
+
+from chacha import key_expansion
+from chacha_numpy import BATCH_BLOCKS, BLOCK_SIZE, keystream_from_template
+
+
+class ChaCha20Cipher:
+    """
+    Contexte de chiffrement ChaCha20 créé une fois par couple (clé, nonce), pour chiffrer
+    un flot de données morceau par morceau avec une mémoire constante.
+
+    L'état initial de 16 mots est préparé une seule fois (`template`), seul le compteur de
+    blocs (mot 15) changeant d'un bloc à l'autre. Le flot de clés non utilisé du dernier bloc
+    entamé est conservé entre deux appels à `update`. Le chiffré obtenu est identique à celui
+    de `encrypt` appliqué au message entier.
+    """
+
+    __slots__ = ("template", "position", "_pending")
+
+    def __init__(self, key, nonce):
+        """
+        :param key: Clé de 32 octets.
+        :param nonce: Nonce de 8 octets.
+        """
+        assert len(nonce) == 8  # Vérification de la taille du nonce
+        self.template = array('I', key_expansion(key, nonce + bytes(4)))
+        self.position = 0      # Position courante dans le flot, en octets.
+        self._pending = b''    # Flot de clés restant du bloc entamé.
+
+    def keystream(self, n_bytes):
+        """
+        Renvoie les `n_bytes` prochains octets du flot de clés et avance la position d'autant.
+
+        :param n_bytes: Nombre d'octets.
+        :return: Le flot de clés sous forme de tableau uint8.
+        """
+        pending = self._pending
+        if n_bytes <= len(pending):
+            self._pending = pending[n_bytes:]
+            self.position += n_bytes
+            return np.frombuffer(pending[:n_bytes], dtype=np.uint8)
+
+        out = np.empty(n_bytes, dtype=np.uint8)
+        out[:len(pending)] = np.frombuffer(pending, dtype=np.uint8)
+        filled = len(pending)
+        # Après le flot en attente, la position est toujours alignée sur un bloc.
+        block = (self.position + filled) // BLOCK_SIZE
+        while filled < n_bytes:
+            count = min(BATCH_BLOCKS, (n_bytes - filled + BLOCK_SIZE - 1) // BLOCK_SIZE)
+            blocks = self._blocks(block, count)
+            used = min(blocks.size, n_bytes - filled)
+            out[filled:filled + used] = blocks[:used]
+            filled += used
+            block += count
+            self._pending = blocks[used:].tobytes()
+        self.position += n_bytes
+        return out
+
+    def _blocks(self, block, count):
+        """
+        :param block: Numéro du premier bloc, à partir du début du message.
+        :param count: Nombre de blocs.
+        :return: Le flot de clés de ces blocs, sous forme de tableau uint8.
+        """
+        return keystream_from_template(self.template, block, count)
+
+    def update(self, chunk):
+        """
+        Chiffre (ou déchiffre) le morceau suivant du flot.
+
+        :param chunk: Octets à traiter.
+        :return: Le résultat, de même longueur que `chunk`.
+        """
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        return np.bitwise_xor(data, self.keystream(data.size)).tobytes()
+
+    def seek(self, byte_offset):
+        """
+        Se place directement à la position `byte_offset` du flot, en positionnant le compteur de blocs.
+
+        :param byte_offset: Position en octets depuis le début du message.
+        """
+        block, skip = divmod(byte_offset, BLOCK_SIZE)
+        self.position = block * BLOCK_SIZE
+        self._pending = b''
+        if skip:
+            self.keystream(skip)
+
+    def tell(self):
+        """
+        :return: La position courante dans le flot, en octets.
+        """
+        return self.position
+
+    @property
+    def counter(self):
+        """Compteur du prochain bloc à calculer."""
+        return (self.position + len(self._pending)) // BLOCK_SIZE
+
+
+def encrypt_stream(source, destination, key, nonce, chunk_size=1 << 16):
+    """
+    Chiffre (ou déchiffre) le contenu d'un objet fichier (fichier, socket via `makefile`, ...)
+    vers un autre, morceau par morceau.
+
+    :param source: Objet disposant d'une méthode `read`.
+    :param destination: Objet disposant d'une méthode `write`.
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 8 octets.
+    :param chunk_size: Taille des morceaux lus.
+    :return: Le nombre d'octets traités.
+    """
+    cipher = ChaCha20Cipher(key, nonce)
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return cipher.tell()
+        destination.write(cipher.update(chunk))
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : chiffrement par morceaux de tailles quelconques et accès direct.
+    import io
+    import os
+    from chacha import encrypt
+
+    key = os.urandom(32)
+    nonce = os.urandom(8)
+    message = os.urandom(10000)
+    reference = encrypt(message, key, nonce)
+
+    cipher = ChaCha20Cipher(key, nonce)
+    pieces = []
+    offset = 0
+    for size in (1, 63, 64, 65, 500, 9307):
+        pieces.append(cipher.update(message[offset:offset + size]))
+        offset += size
+    assert b''.join(pieces) == reference
+
+    cipher.seek(4321)
+    assert cipher.update(message[4321:5000]) == reference[4321:5000]
+
+    destination = io.BytesIO()
+    encrypt_stream(io.BytesIO(message), destination, key, nonce, chunk_size=1000)
+    assert destination.getvalue() == reference
+    print("Chiffrement par flot identique à encrypt")
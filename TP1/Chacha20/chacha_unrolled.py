@@ -0,0 +1,140 @@
+import random
+import struct
+
+from chacha import chacha_core, doubleround, key_expansion
+from chacha_numpy import COLUMNS, ROWS
+
+ROUND_COUNTS = (8, 12, 20)
+
+
+def _quarter_round_source(a, b, c, d):
+    """
+    Code source d'un 'Quarter Round' sur les variables locales xa, xb, xc, xd. Le XOR et la rotation
+    tiennent en une instruction : multiplier le mot par 0x100000001 le recopie au-dessus de lui-même,
+    et un seul décalage suivi d'un masque donne alors la rotation à gauche.
+    """
+    lines = []
+    for (p, q, r), shift in zip(((a, b, d), (c, d, b), (a, b, d), (c, d, b)), (16, 12, 8, 7)):
+        lines.append(f"x{p} = (x{p} + x{q}) & 0xffffffff")
+        lines.append(f"x{r} = (((x{r} ^ x{p}) * 0x100000001) >> {32 - shift}) & 0xffffffff")
+    return lines
+
+
+def core_source(rounds):
+    """
+    Génère le code source d'une fonction `chacha_core` entièrement déroulée : les 16 mots de l'état
+    sont des variables locales, sans appel de fonction, tuple ni accès à une liste pendant les rounds.
+
+    :param rounds: Nombre de rounds (pair : chaque 'Double Round' compte pour deux).
+    :return: Le code source de la fonction `core(x)`.
+    :raises ValueError: Si le nombre de rounds n'est pas un entier pair strictement positif.
+    """
+    if not isinstance(rounds, int) or rounds <= 0 or rounds % 2:
+        raise ValueError("Le nombre de rounds doit être un entier pair strictement positif.")
+    names = ", ".join(f"x{i}" for i in range(16))
+    originals = ", ".join(f"j{i}" for i in range(16))
+    body = [f"{names} = x", f"{originals} = x"]
+    for _ in range(rounds // 2):
+        for indices in COLUMNS + ROWS:
+            body.extend(_quarter_round_source(*indices))
+    result = ", ".join(f"(x{i} + j{i}) & 0xffffffff" for i in range(16))
+    body.append(f"return [{result}]")
+    return "def core(x):\n" + "".join(f"    {line}\n" for line in body)
+
+
+def make_core(rounds):
+    """
+    Compile la fonction déroulée pour un nombre de rounds donné, et la vérifie avec `self_check`
+    avant de la renvoyer.
+
+    :param rounds: Nombre de rounds (entier pair strictement positif).
+    :return: Une fonction prenant et renvoyant une liste de 16 mots de 32 bits.
+    """
+    namespace = {}
+    exec(compile(core_source(rounds), f"<chacha_core_{rounds}>", "exec"), namespace)
+    core = namespace["core"]
+    self_check({rounds: core})
+    return core
+
+
+def reference_core(x, rounds):
+    """
+    Version de référence à nombre de rounds variable, construite sur `doubleround` de `chacha`.
+
+    :param x: État initial de 16 mots de 32 bits.
+    :param rounds: Nombre de rounds.
+    :return: État transformé après l'addition finale.
+    """
+    original_x = x[:]
+    x = x[:]
+    for _ in range(rounds // 2):
+        x = doubleround(x)
+    return [(xi + original_xi) & 0xffffffff for xi, original_xi in zip(x, original_x)]
+
+
+def self_check(cores, trials=8):
+    """
+    Compare les fonctions générées aux fonctions existantes sur des états aléatoires
+    (`chacha_core` pour 20 rounds, `reference_core` pour les autres).
+
+    :param cores: Dictionnaire {nombre de rounds: fonction générée}.
+    :param trials: Nombre d'états testés.
+    """
+    rng = random.Random(0)
+    for _ in range(trials):
+        state = [rng.getrandbits(32) for _ in range(16)]
+        for rounds, core in cores.items():
+            expected = chacha_core(state[:]) if rounds == 20 else reference_core(state, rounds)
+            if core(state) != expected:
+                raise RuntimeError(f"Le cœur ChaCha{rounds} généré ne correspond pas à la référence.")
+
+
+# Génération et vérification à l'import, avant toute utilisation.
+CORES = {rounds: make_core(rounds) for rounds in ROUND_COUNTS}
+chacha_core_unrolled = CORES[20]
+
+
+def encrypt_unrolled(plaintext, key, nonce, rounds=20):
+    """
+    Chiffre un message comme `encrypt`, avec le cœur déroulé. L'état initial n'est préparé qu'une
+    fois, et le XOR est fait sur chaque bloc entier via `int.from_bytes`.
+
+    :param plaintext: Message en clair sous forme d'octets.
+    :param key: Clé de 32 octets.
+    :param nonce: Nonce de 8 octets.
+    :param rounds: Nombre de rounds (8, 12 ou 20, ou tout autre nombre pair strictement positif) ;
+                   avec 20, le résultat est identique à `encrypt`.
+    :return: Message chiffré sous forme d'octets.
+    """
+    assert len(nonce) == 8  # Vérification de la taille du nonce
+    core = CORES[rounds] if rounds in CORES else make_core(rounds)
+    state = key_expansion(key, nonce + bytes(4))
+    pack = struct.Struct('<16I').pack
+    out = bytearray()
+    for block, start in enumerate(range(0, len(plaintext), 64)):
+        state[15] = block
+        chunk = plaintext[start:start + 64]
+        key_stream = pack(*core(state))[:len(chunk)]
+        value = int.from_bytes(chunk, 'little') ^ int.from_bytes(key_stream, 'little')
+        out += value.to_bytes(len(chunk), 'little')
+    return bytes(out)
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation et comparaison des vitesses de ChaCha8, ChaCha12 et ChaCha20.
+    import os
+    import time
+    from chacha import encrypt
+
+    key = os.urandom(32)
+    nonce = os.urandom(8)
+    message = os.urandom(1 << 16)
+
+    start = time.perf_counter()
+    reference = encrypt(message, key, nonce)
+    print(f"encrypt (20 rounds) : {time.perf_counter() - start:.4f} s pour 64 Kio")
+    for rounds in ROUND_COUNTS:
+        start = time.perf_counter()
+        encrypted = encrypt_unrolled(message, key, nonce, rounds)
+        print(f"ChaCha{rounds} déroulé : {time.perf_counter() - start:.4f} s pour 64 Kio")
+    assert encrypt_unrolled(message, key, nonce) == reference
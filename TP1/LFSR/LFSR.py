@@ -25,32 +25,183 @@ def lfsr(seed, taps, length):
     
     return output
 
-def lfsr_debug(seed, taps, length):
+class LFSRTrace:
     """
-    Version détaillée de la fonction LFSR qui affiche les étapes de calcul.
-    
+    Trace des étapes d'un LFSR dans un tampon circulaire de taille bornée.
+
+    Chaque entrée (count, state, out_bit) est regroupée dans un seul entier :
+    `(count << (L + 1)) | (state << 1) | out_bit`, où le bit i de `state` est la case i du registre.
+    Seule une étape sur `every` est enregistrée, et seules les `capacity` dernières sont conservées.
+    Les étapes sont numérotées à la suite sur tous les appels qui partagent la trace (`steps`).
+    """
+
+    BINARY_MAGIC = b'LFTR'
+
+    def __init__(self, capacity=4096, every=1):
+        """
+        :param capacity: Nombre maximal d'entrées conservées.
+        :param every: Enregistre une étape sur `every`.
+        """
+        if capacity < 1 or every < 1:
+            raise ValueError("La capacité et le pas d'échantillonnage doivent être strictement positifs.")
+        self.capacity = capacity
+        self.every = every
+        self.length = None
+        self.steps = 0      # Nombre d'étapes déjà tracées, tous appels confondus.
+        self.recorded = 0
+        self._entries = [0] * capacity
+
+    def record(self, count, state, out_bit):
+        """
+        Enregistre une étape (appelée uniquement pour les étapes échantillonnées).
+
+        :param count: Numéro de l'itération (à partir de 1).
+        :param state: État du registre sous forme d'entier, après le décalage.
+        :param out_bit: Bit de sortie.
+        """
+        self._entries[self.recorded % self.capacity] = (count << (self.length + 1)) | (state << 1) | out_bit
+        self.recorded += 1
+
+    def __len__(self):
+        return min(self.recorded, self.capacity)
+
+    def _packed_entries(self):
+        """
+        :return: Les entrées conservées sous leur forme regroupée, de la plus ancienne à la plus récente.
+        """
+        first = max(0, self.recorded - self.capacity)
+        return [self._entries[i % self.capacity] for i in range(first, self.recorded)]
+
+    def __iter__(self):
+        """
+        Parcourt les entrées conservées, de la plus ancienne à la plus récente.
+
+        :return: Des tuples (count, state, out_bit), `state` étant un entier.
+        """
+        length = self.length
+        state_mask = (1 << length) - 1 if length is not None else 0
+        for entry in self._packed_entries():
+            yield entry >> (length + 1), (entry >> 1) & state_mask, entry & 1
+
+    def state_bits(self, state):
+        """
+        :param state: État sous forme d'entier.
+        :return: L'état sous forme de liste de bits, comme dans `lfsr`.
+        """
+        return [(state >> i) & 1 for i in range(self.length)]
+
+    def dump_csv(self, path):
+        """
+        Écrit la trace dans un fichier CSV (count,state,outbit), l'état étant écrit comme une chaîne de bits.
+
+        :param path: Chemin du fichier.
+        """
+        with open(path, 'w') as f:
+            f.write("count,state,outbit\n")
+            for count, state, out_bit in self:
+                bits = ''.join(str(bit) for bit in self.state_bits(state))
+                f.write(f"{count},{bits},{out_bit}\n")
+
+    def dump_binary(self, path):
+        """
+        Écrit la trace dans un fichier binaire compact : un en-tête `LFTR` suivi de L, `every`
+        et du nombre d'entrées (entiers 32 bits petit-boutistes), puis chaque entrée regroupée
+        sur un nombre fixe d'octets petit-boutistes.
+
+        :param path: Chemin du fichier.
+        """
+        entries = self._packed_entries()
+        # Taille fixée par la plus grande entrée, et non par la dernière.
+        entry_size = (max(entries, default=0).bit_length() + 7) // 8
+        with open(path, 'wb') as f:
+            f.write(self.BINARY_MAGIC)
+            for value in (self.length, self.every, len(entries), entry_size):
+                f.write(value.to_bytes(4, 'little'))
+            for entry in entries:
+                f.write(entry.to_bytes(entry_size, 'little'))
+
+    @classmethod
+    def load_binary(cls, path):
+        """
+        Relit une trace écrite par `dump_binary`.
+
+        :param path: Chemin du fichier.
+        :return: Un nouvel objet `LFSRTrace` contenant les entrées du fichier.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:4] != cls.BINARY_MAGIC:
+            raise ValueError("Fichier de trace LFSR invalide.")
+        length, every, n_entries, entry_size = (int.from_bytes(data[4 + 4 * i:8 + 4 * i], 'little') for i in range(4))
+        trace = cls(capacity=max(n_entries, 1), every=every)
+        trace.length = length
+        for i in range(n_entries):
+            offset = 20 + i * entry_size
+            trace._entries[i] = int.from_bytes(data[offset:offset + entry_size], 'little')
+        trace.recorded = n_entries
+        # Le fichier ne contient que les étapes échantillonnées : la numérotation reprend après la dernière.
+        trace.steps = max(trace._entries[:n_entries], default=0) >> (length + 1)
+        return trace
+
+    def print_table(self):
+        """
+        Affiche les entrées conservées sous forme de tableau (count, state, outbit).
+        """
+        print("count\tstate\t\toutbit")
+        print("-" * 148)
+        for count, state, out_bit in self:
+            print(f"{count}\t{self.state_bits(state)}\t\t{out_bit}")
+        print("-" * 148)
+
+def lfsr_debug(seed, taps, length, trace=None):
+    """
+    Version instrumentée de la fonction LFSR qui enregistre les étapes de calcul dans une trace.
+
+    L'état du registre est conservé dans un entier (le bit i est la case i du registre) et chaque
+    étape échantillonnée est ajoutée à un tampon circulaire : le coût de la trace est constant
+    par étape, quelle que soit la longueur de la séquence.
+
     :param seed: État initial du LFSR.
     :param taps: Positions pour l'opération XOR, indexées à partir de 1.
     :param length: Nombre de bits à générer.
-    :return: La séquence générée tout en affichant les détails du processus.
+    :param trace: Objet `LFSRTrace` à remplir. S'il est absent, une trace est créée puis affichée à la fin.
+                  Une même trace peut servir à plusieurs appels, avec des registres de même longueur :
+                  la numérotation des étapes et l'échantillonnage reprennent là où l'appel précédent s'est arrêté.
+    :return: La séquence générée.
+    :raises ValueError: Si la trace contient déjà des états d'un registre d'une autre longueur.
     """
-    taps = [tap - 1 for tap in taps]
-    sr = seed[:]
+    show = trace is None
+    if show:
+        trace = LFSRTrace()
+    register_length = len(seed)
+    # Les entrées déjà enregistrées sont décodées avec trace.length : il ne peut pas changer.
+    if trace.length is not None and trace.length != register_length:
+        raise ValueError(f"La trace concerne un registre de {trace.length} bits, pas de {register_length}.")
+    trace.length = register_length
+    every = trace.every
+    record = trace.record
+    first = trace.steps
+
+    tap_mask = 0
+    for tap in taps:
+        tap_mask ^= 1 << (tap - 1)
+    mask = (1 << register_length) - 1
+    state = 0
+    for bit in reversed(seed):
+        state = (state << 1) | bit
     output = []
 
-    print("count\tstate\t\toutbit\tseq")
-    print("-" * 148)
-    
-    for count in range(1, length + 1):
-        feedback_bit = sum([sr[tap] for tap in taps]) % 2
-        sr.insert(0, feedback_bit)
-        out_bit = sr.pop()
+    for count in range(first + 1, first + length + 1):
+        out_bit = state >> (register_length - 1)
+        feedback_bit = (state & tap_mask).bit_count() & 1
+        state = ((state << 1) | feedback_bit) & mask
         output.append(out_bit)
+        if count % every == 0:
+            record(count, state, out_bit)
+    trace.steps = first + length
 
-        # Affichage des informations de chaque étape.
-        print(f"{count}\t{sr}\t\t{out_bit}\t{output}")
-    
-    print("-" * 148)
+    if show:
+        trace.print_table()
     return output
 
 def Berlekamp_Massey(sequence):
@@ -91,20 +242,25 @@ def Berlekamp_Massey(sequence):
 
     return f  
 
-# Utilisation des fonctions définies.
-seed = [1, 1, 1, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 1, 0, 0]
-taps = [16, 14, 13, 11]
-sequence = lfsr(seed, taps, 32)
-print("The LFSR sequence is:")
-print(sequence)
+if __name__ == "__main__":
+    # Utilisation des fonctions définies.
+    seed = [1, 1, 1, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 1, 0, 0]
+    taps = [16, 14, 13, 11]
+    sequence = lfsr(seed, taps, 32)
+    print("The LFSR sequence is:")
+    print(sequence)
 
-# Affichage détaillé des calculs pour débogage.
-lfsr_debug(seed, taps, 32)  
+    # Affichage détaillé des calculs pour débogage.
+    lfsr_debug(seed, taps, 32)  
 
-# Test de différents longueurs de séquences avec l'algorithme de Berlekamp-Massey.
-lengths_to_test = [10, 17, 31]
-for test_length in lengths_to_test:
-    test_sequence = sequence[:test_length]
-    print(f"Polynomial coefficients for the first {test_length} bits:")
-    print(Berlekamp_Massey(test_sequence))
+    # Trace échantillonnée d'une longue génération, conservée dans un tampon circulaire.
+    trace = LFSRTrace(capacity=1024, every=100)
+    lfsr_debug(seed, taps, 100000, trace)
+    print(f"{len(trace)} étapes conservées, dernière étape : {list(trace)[-1]}")
 
+    # Test de différents longueurs de séquences avec l'algorithme de Berlekamp-Massey.
+    lengths_to_test = [10, 17, 31]
+    for test_length in lengths_to_test:
+        test_sequence = sequence[:test_length]
+        print(f"Polynomial coefficients for the first {test_length} bits:")
+        print(Berlekamp_Massey(test_sequence))
@@ -0,0 +1,137 @@
+from array import array
+
+from LFSR import Berlekamp_Massey
+
+
+class BerlekampMassey:
+    """
+    Algorithme de Berlekamp-Massey incrémental, les polynômes et la séquence étant stockés
+    dans des entiers (le bit i du polynôme est le coefficient de x^i).
+
+    Les derniers bits de la séquence sont conservés à l'envers dans une fenêtre (le bit i vaut
+    s(N - i)), ce qui permet de calculer la discordance en un seul ET suivi d'un comptage de bits,
+    et la mise à jour du polynôme de connexion en un seul XOR décalé. La fenêtre est bornée par
+    un masque un peu plus large que le polynôme de connexion : son coût par bit dépend de L et
+    non de N. Quand le polynôme dépasse le masque, la fenêtre est reconstruite à partir de
+    l'historique complet des bits, qui reste nécessaire car L peut sauter jusqu'à N + 1 - L :
+    la mémoire utilisée croît donc avec N, à raison de N / 8 octets (bits regroupés par octet).
+    """
+
+    __slots__ = ("connection", "previous", "linear_complexity", "last_update", "count", "profile",
+                 "_window", "_window_mask", "_history")
+
+    def __init__(self):
+        self.connection = 1         # Polynôme de connexion courant C(x).
+        self.previous = 1           # Polynôme B(x) avant la dernière augmentation de L.
+        self.linear_complexity = 0  # Longueur L du plus court LFSR générant la séquence.
+        self.last_update = -1       # Position m de la dernière augmentation de L.
+        self.count = 0              # Nombre N de bits déjà traités.
+        self.profile = array('I')   # Complexité linéaire après chaque bit.
+        self._window = 0
+        self._window_mask = (1 << 64) - 1
+        self._history = bytearray()  # Séquence lue, par octets complets (premier bit en poids fort).
+
+    def update(self, bits):
+        """
+        Traite une suite de bits.
+
+        :param bits: Itérable de bits (0 ou 1).
+        :return: L'objet lui-même.
+        """
+        connection = self.connection
+        previous = self.previous
+        linear_complexity = self.linear_complexity
+        last_update = self.last_update
+        n = self.count
+        window = self._window
+        window_mask = self._window_mask
+        history = self._history
+        profile = []
+
+        for bit in bits:
+            window = ((window << 1) | (bit & 1)) & window_mask
+            if n & 7 == 7:
+                # Les 8 derniers bits sont les 8 bits de poids faible de la fenêtre.
+                history.append(window & 0xff)
+            if (connection & window).bit_count() & 1:
+                t = connection
+                connection ^= previous << (n - last_update)
+                if 2 * linear_complexity <= n:
+                    linear_complexity = n + 1 - linear_complexity
+                    last_update = n
+                    previous = t
+                if connection > window_mask:
+                    # Fenêtre trop courte pour le nouveau polynôme : elle est doublée et relue dans l'historique.
+                    width = 2 * connection.bit_length()
+                    window_mask = (1 << width) - 1
+                    pending = (n + 1) & 7  # Bits pas encore regroupés dans l'historique.
+                    packed = int.from_bytes(history[-((width - pending + 7) // 8):], 'big')
+                    window = ((packed << pending) | (window & ((1 << pending) - 1))) & window_mask
+            profile.append(linear_complexity)
+            n += 1
+
+        self.connection = connection
+        self.previous = previous
+        self.linear_complexity = linear_complexity
+        self.last_update = last_update
+        self.count = n
+        self._window = window
+        self._window_mask = window_mask
+        self.profile.extend(profile)
+        return self
+
+    def update_bytes(self, data):
+        """
+        Traite un bloc d'octets, chaque octet étant lu du bit de poids fort au bit de poids faible.
+
+        :param data: Octets à traiter.
+        :return: L'objet lui-même.
+        """
+        # Lecture octet par octet : décaler un seul entier de 8 * len(data) bits coûterait O(N) par bit.
+        return self.update((byte >> shift) & 1 for byte in bytes(data) for shift in range(7, -1, -1))
+
+    def coefficients(self):
+        """
+        :return: Les L + 1 coefficients du polynôme de connexion, du terme constant au terme de degré L.
+        """
+        connection = self.connection
+        return [(connection >> i) & 1 for i in range(self.linear_complexity + 1)]
+
+
+def berlekamp_massey_fast(sequence):
+    """
+    Équivalent de `Berlekamp_Massey(sequence)` utilisant la version à base d'entiers.
+
+    :param sequence: La séquence binaire pour laquelle le polynôme minimal est calculé.
+    :return: Liste des coefficients du polynôme minimal (L + 1 coefficients).
+    """
+    return BerlekampMassey().update(sequence).coefficients()
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation et comparaison avec `Berlekamp_Massey`.
+    import os
+    import time
+    from lfsr_engine import lfsr_bytes
+
+    seed = [1, 1, 1, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 1, 0, 0]
+    taps = [16, 14, 13, 11]
+    data = lfsr_bytes(seed, taps, 32)
+
+    bm = BerlekampMassey()
+    for i in range(len(data)):
+        bm.update_bytes(data[i:i + 1])
+        print(f"Polynomial coefficients for the first {bm.count} bits:")
+        print(bm.coefficients())
+    print("Linear complexity profile:", list(bm.profile))
+
+    # Les coefficients coïncident avec ceux de `Berlekamp_Massey`, aux zéros de fin près.
+    sequence = [1, 0, 1, 1, 0, 0, 0, 1, 1, 1, 1, 0, 1] * 50
+    fast = berlekamp_massey_fast(sequence)
+    reference = Berlekamp_Massey(sequence)
+    assert reference[:len(fast)] == fast and not any(reference[len(fast):])
+
+    random_bits = os.urandom(4096)
+    start = time.perf_counter()
+    BerlekampMassey().update_bytes(random_bits)
+    print(f"Complexité linéaire de {8 * len(random_bits)} bits calculée en {time.perf_counter() - start:.3f} s")
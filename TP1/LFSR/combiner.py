@@ -0,0 +1,65 @@
+from lfsr_engine import LFSREngine
+
+
+def geffe(x1, x2, x3):
+    """
+    Fonction de combinaison de Geffe : x2 sélectionne x1 (si x2 = 1) ou x3 (si x2 = 0).
+    Elle s'applique bit à bit, donc aussi à des entiers regroupant de nombreux bits.
+
+    :param x1, x2, x3: Bits (ou entiers positifs) issus des trois registres.
+    :return: (x1 ET x2) XOR (NON x2 ET x3).
+    """
+    return (x1 & x2) ^ (~x2 & x3)
+
+
+class CombinerGenerator:
+    """
+    Générateur par combinaison : plusieurs LFSR avancent en parallèle et leurs sorties
+    sont combinées par une fonction booléenne appliquée bit à bit.
+
+    Chaque registre produit ses bits par octets (`LFSREngine`), et la fonction de
+    combinaison est appliquée une seule fois sur des entiers regroupant tous les bits.
+    """
+
+    def __init__(self, registers, combine=geffe):
+        """
+        :param registers: Liste de couples (seed, taps), un par registre.
+        :param combine: Fonction booléenne à appliquer bit à bit (par défaut, celle de Geffe).
+        """
+        self.engines = [LFSREngine(seed, taps) for seed, taps in registers]
+        self.combine = combine
+
+    def keystream(self, length):
+        """
+        Génère les `length` prochains bits du flot.
+
+        :param length: Nombre de bits à générer.
+        :return: Les bits générés sous forme de `bytes` (premier bit en poids fort, comme `lfsr_bytes`).
+        """
+        n_bytes = (length + 7) // 8
+        outputs = [int.from_bytes(engine.read_bits(length), 'big') for engine in self.engines]
+        mask = ((1 << length) - 1) << (8 * n_bytes - length)
+        return (self.combine(*outputs) & mask).to_bytes(n_bytes, 'big')
+
+
+def geffe_keystream(seeds, taps, length):
+    """
+    Génère le flot d'un générateur de Geffe.
+
+    :param seeds: Les trois états initiaux (listes de bits).
+    :param taps: Les trois listes de robinets, indexées à partir de 1.
+    :param length: Nombre de bits à générer.
+    :return: Le flot sous forme de `bytes`.
+    """
+    return CombinerGenerator(list(zip(seeds, taps)), geffe).keystream(length)
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : générateur de Geffe à trois registres.
+    seeds = [
+        [1, 1, 1, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 1, 0, 0],
+        [0, 1, 1, 0, 1, 0, 1, 1, 1, 0, 0, 1, 0, 1, 1, 0, 1],
+        [1, 0, 0, 1, 1, 1, 0, 1, 0, 1, 1, 0, 0, 0, 1, 1, 0, 1],
+    ]
+    taps = [[16, 14, 13, 11], [17, 14], [18, 11]]
+    print("Geffe keystream:", geffe_keystream(seeds, taps, 64).hex())
@@ -0,0 +1,121 @@
+import numpy as np
+
+from lfsr_batch import lfsr_batch
+from lfsr_engine import state_to_seed
+
+
+def walsh_hadamard(values):
+    """
+    Transformée de Walsh-Hadamard rapide : W(x) = somme sur a de F(a) * (-1)^<a, x>.
+
+    :param values: Tableau de taille 2^L.
+    :return: La transformée, dans un nouveau tableau.
+    """
+    w = np.array(values)
+    n = w.size
+    if n & (n - 1):
+        raise ValueError("La taille doit être une puissance de 2.")
+    h = 1
+    while h < n:
+        w = w.reshape(-1, 2, h)
+        low = w[:, 0, :].copy()
+        high = w[:, 1, :]
+        w[:, 0, :] += high
+        w[:, 1, :] = low - high
+        h *= 2
+    return w.reshape(n)
+
+
+def output_masks(register_length, taps, n_bits):
+    """
+    Exprime chaque bit de sortie d'un LFSR comme une forme linéaire de son état initial.
+
+    Le bit j du masque numéro t vaut 1 si s(t) dépend de la case j de l'état initial. Ces masques
+    sont obtenus en faisant tourner en parallèle les L registres initialisés aux vecteurs unitaires.
+
+    :param register_length: Longueur L du registre (au plus 62).
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+    :param n_bits: Nombre de bits de sortie.
+    :return: Tableau int64 de `n_bits` masques.
+    """
+    streams = lfsr_batch(np.eye(register_length, dtype=np.uint8), taps, n_bits)
+    bits = np.unpackbits(streams, axis=1)[:, :n_bits].astype(np.int64)
+    weights = np.left_shift(np.int64(1), np.arange(register_length, dtype=np.int64))
+    return weights @ bits
+
+
+def correlation_attack(keystream, register_length, taps, n_bits, candidates=5, positions=None):
+    """
+    Attaque par corrélation (Siegenthaler) sur un registre d'un générateur par combinaison.
+
+    Pour chaque état initial x, on mesure C(x) = somme sur t de (-1)^(z(t) + s_x(t)), où s_x est
+    la sortie du registre initialisé à x. Comme s_x(t) = <a(t), x> avec a(t) le masque du bit t,
+    en regroupant les (-1)^z(t) par masque dans un tableau F de taille 2^L, tous les C(x) sont
+    donnés d'un coup par la transformée de Walsh-Hadamard de F, en O(L 2^L) au lieu de O(N 2^L).
+
+    :param keystream: Flot observé, sous forme d'octets (premier bit en poids fort).
+    :param register_length: Longueur L du registre attaqué.
+    :param taps: Robinets du registre attaqué.
+    :param n_bits: Nombre de bits du flot à utiliser.
+    :param candidates: Nombre de meilleurs candidats à renvoyer.
+    :param positions: Positions du flot à utiliser (tableau booléen de taille `n_bits`), toutes par défaut.
+    :return: Liste de couples (seed, corrélation), la corrélation C(x) / N étant comprise entre -1 et 1.
+    """
+    z = np.unpackbits(np.frombuffer(bytes(keystream), dtype=np.uint8))[:n_bits]
+    if z.size < n_bits:
+        raise ValueError("Le flot contient moins de bits que demandé.")
+    masks = output_masks(register_length, taps, n_bits)
+    if positions is not None:
+        positions = np.asarray(positions, dtype=bool)
+        z = z[positions]
+        masks = masks[positions]
+
+    signs = 1 - 2 * z.astype(np.int32)
+    table = np.bincount(masks, weights=signs, minlength=1 << register_length).astype(np.int32)
+    correlations = walsh_hadamard(table)
+
+    best = np.argpartition(-correlations, candidates - 1)[:candidates]
+    best = best[np.argsort(-correlations[best])]
+    return [(state_to_seed(int(x), register_length), correlations[x] / z.size) for x in best]
+
+
+def geffe_attack(keystream, registers, n_bits):
+    """
+    Retrouve les trois états initiaux d'un générateur de Geffe.
+
+    La sortie vaut x1 avec probabilité 3/4 et x3 avec probabilité 3/4 : ces deux registres sont
+    retrouvés par corrélation. Aux positions où x1 et x3 diffèrent, le bit de sortie révèle
+    exactement x2 (x2 = 1 si z = x1), qui est alors retrouvé par la même transformée.
+
+    :param keystream: Flot observé, sous forme d'octets.
+    :param registers: Les trois couples (longueur, taps) des registres.
+    :param n_bits: Nombre de bits du flot à utiliser.
+    :return: Les trois états initiaux (listes de bits).
+    """
+    (length1, taps1), (length2, taps2), (length3, taps3) = registers
+    seed1 = correlation_attack(keystream, length1, taps1, n_bits, candidates=1)[0][0]
+    seed3 = correlation_attack(keystream, length3, taps3, n_bits, candidates=1)[0][0]
+
+    x1 = np.unpackbits(lfsr_batch([seed1], taps1, n_bits)[0])[:n_bits]
+    x3 = np.unpackbits(lfsr_batch([seed3], taps3, n_bits)[0])[:n_bits]
+    z = np.unpackbits(np.frombuffer(bytes(keystream), dtype=np.uint8))[:n_bits]
+    selector = np.packbits(1 - (z ^ x1)).tobytes()
+    seed2 = correlation_attack(selector, length2, taps2, n_bits, candidates=1, positions=x1 != x3)[0][0]
+    return seed1, seed2, seed3
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : attaque d'un générateur de Geffe à registres de 20 à 22 bits.
+    import random
+    import time
+    from combiner import geffe_keystream
+
+    registers = [(20, [20, 17]), (21, [21, 19]), (22, [22, 21])]
+    seeds = [[random.getrandbits(1) for _ in range(length)] for length, _ in registers]
+    n_bits = 4000
+    keystream = geffe_keystream(seeds, [taps for _, taps in registers], n_bits)
+
+    start = time.perf_counter()
+    recovered = geffe_attack(keystream, registers, n_bits)
+    print(f"Attaque terminée en {time.perf_counter() - start:.2f} s")
+    print("États retrouvés :", list(recovered) == seeds)
@@ -0,0 +1,82 @@
+# Arithmétique des polynômes sur GF(2) représentés par des entiers :
+# le bit i de l'entier est le coefficient de x^i.
+
+
+def poly_degree(a):
+    """
+    :param a: Polynôme sous forme d'entier.
+    :return: Le degré du polynôme (-1 pour le polynôme nul).
+    """
+    return a.bit_length() - 1
+
+
+def poly_mul(a, b):
+    """
+    Multiplication sans retenue de deux polynômes.
+
+    :param a, b: Polynômes sous forme d'entiers.
+    :return: Le produit a * b.
+    """
+    if a.bit_length() < b.bit_length():
+        a, b = b, a
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a <<= 1
+        b >>= 1
+    return result
+
+
+def poly_square(a):
+    """
+    Carré d'un polynôme : sur GF(2), il suffit d'intercaler un zéro entre chaque coefficient.
+
+    :param a: Polynôme sous forme d'entier.
+    :return: a^2.
+    """
+    return int('0'.join(bin(a)[2:]), 2)
+
+
+def poly_mod(a, m):
+    """
+    Reste de la division euclidienne de a par m.
+
+    :param a: Dividende.
+    :param m: Diviseur non nul.
+    :return: a mod m.
+    """
+    degree_m = m.bit_length() - 1
+    shift = a.bit_length() - 1 - degree_m
+    while shift >= 0:
+        a ^= m << shift
+        shift = a.bit_length() - 1 - degree_m
+    return a
+
+
+def poly_mulmod(a, b, m):
+    """
+    :param a, b: Polynômes sous forme d'entiers.
+    :param m: Module.
+    :return: a * b mod m.
+    """
+    return poly_mod(poly_mul(a, b), m)
+
+
+def poly_powmod(a, n, m):
+    """
+    Exponentiation rapide (carré et multiplication) modulo m.
+
+    :param a: Base.
+    :param n: Exposant entier positif.
+    :param m: Module.
+    :return: a^n mod m.
+    """
+    result = poly_mod(1, m)
+    a = poly_mod(a, m)
+    while n:
+        if n & 1:
+            result = poly_mulmod(result, a, m)
+        a = poly_mod(poly_square(a), m)
+        n >>= 1
+    return result
@@ -0,0 +1,98 @@
+import numpy as np
+
+from lfsr_engine import taps_to_mask
+
+# Nombre de bits de sortie calculés par opération NumPy au-delà duquel on cesse de décimer.
+TARGET_CHUNK = 1024
+# Nombre de pas de temps convertis à la fois lors du regroupement final en octets.
+UNPACK_ROWS = 4096
+
+
+def _slice_seeds(seeds, n_lanes):
+    """
+    Transpose les états initiaux en « tranches de bits » : le bit k du mot [j, lane]
+    est le bit de sortie s(j) de la graine numéro 64 * lane + k.
+
+    :param seeds: Tableau (n_seeds, L) de bits.
+    :param n_lanes: Nombre de mots de 64 bits par pas de temps.
+    :return: Tableau (L, n_lanes) de uint64.
+    """
+    n_seeds, length = seeds.shape
+    padded = np.zeros((n_lanes * 64, length), dtype=np.uint8)
+    padded[:n_seeds] = seeds
+    # Les L premiers bits de sortie sont l'état initial lu à l'envers.
+    bits = np.ascontiguousarray(padded[:, ::-1].T).reshape(length, n_lanes, 64)
+    packed = np.packbits(bits, axis=2, bitorder='little')
+    return packed.view('<u8').reshape(length, n_lanes)
+
+
+def lfsr_batch(seeds, taps, length):
+    """
+    Exécute `lfsr(seed, taps, length)` pour toutes les graines d'un tableau en une seule passe vectorisée.
+
+    Les registres sont découpés en tranches de bits : chaque mot uint64 contient le même bit
+    de 64 registres différents, si bien qu'un XOR NumPy fait avancer tous les registres ensemble.
+    La suite vérifie s(n) = somme des s(n - tap) ; comme pour `LFSREngine`, on double les
+    robinets (C(x)^2 = C(x^2)) pour calculer des blocs de plus en plus grands de pas de temps
+    en une seule opération.
+
+    :param seeds: Tableau (n_seeds, L) de bits, une graine par ligne.
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1 (communes à toutes les graines).
+    :param length: Nombre de bits à générer par graine.
+    :return: Tableau uint8 (n_seeds, ceil(length / 8)), chaque ligne étant égale à `lfsr_bytes(seed, taps, length)`.
+    """
+    seeds = np.asarray(seeds, dtype=np.uint8) & 1
+    if seeds.ndim != 2:
+        raise ValueError("Les graines doivent former un tableau à deux dimensions (n_seeds, L).")
+    n_seeds, register_length = seeds.shape
+    if any(tap < 1 or tap > register_length for tap in taps):
+        raise ValueError("Les robinets doivent être compris entre 1 et la longueur du registre.")
+    tap_mask = taps_to_mask(taps)
+    taps = [i + 1 for i in range(register_length) if (tap_mask >> i) & 1]
+
+    n_lanes = (n_seeds + 63) // 64
+    total = max(length, register_length)
+    sequence = np.zeros((total, n_lanes), dtype='<u8')
+    sequence[:register_length] = _slice_seeds(seeds, n_lanes)
+
+    position = register_length
+    scale = 1
+    while taps and position < total:
+        chunk = taps[0] * scale
+        # La récurrence décimée par `scale` n'est valable qu'à partir du pas L * scale.
+        stop = total if chunk >= TARGET_CHUNK else min(total, 2 * register_length * scale)
+        shifts = [tap * scale for tap in taps]
+        while position < stop:
+            k = min(chunk, stop - position)
+            out = sequence[position:position + k]
+            first = position - shifts[0]
+            np.copyto(out, sequence[first:first + k])
+            for shift in shifts[1:]:
+                start = position - shift
+                np.bitwise_xor(out, sequence[start:start + k], out=out)
+            position += k
+        scale *= 2
+
+    result = np.empty((n_seeds, (length + 7) // 8), dtype=np.uint8)
+    for start in range(0, length, UNPACK_ROWS):
+        stop = min(start + UNPACK_ROWS, length)
+        rows = sequence[start:stop].view(np.uint8)
+        bits = np.unpackbits(rows, axis=1, bitorder='little')[:, :n_seeds]
+        result[:, start // 8:(stop + 7) // 8] = np.packbits(bits.T, axis=1)
+    return result
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation et vérification par rapport à `lfsr_bytes`.
+    import time
+    from lfsr_engine import lfsr_bytes
+
+    taps = [16, 14, 13, 11]
+    rng = np.random.default_rng(0)
+    seeds = rng.integers(0, 2, size=(10000, 16), dtype=np.uint8)
+
+    start = time.perf_counter()
+    streams = lfsr_batch(seeds, taps, 4096)
+    print(f"{len(seeds)} graines x 4096 bits générés en {time.perf_counter() - start:.3f} s")
+    for i in (0, 1, 9999):
+        assert streams[i].tobytes() == lfsr_bytes(seeds[i].tolist(), taps, 4096)
@@ -0,0 +1,355 @@
+from LFSR import lfsr
+from gf2_poly import poly_powmod
+
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+
+
+def seed_to_state(seed):
+    """
+    Convertit un état initial sous forme de liste de bits en entier.
+
+    Le bit de sortie suivant (dernier élément de la liste) devient le bit de poids fort,
+    de sorte que l'entier, lu en binaire, donne les L prochains bits de sortie dans l'ordre.
+
+    :param seed: État initial du LFSR (liste de bits), comme pour `lfsr`.
+    :return: L'état sous forme d'entier.
+    """
+    state = 0
+    for bit in reversed(seed):
+        state = (state << 1) | (bit & 1)
+    return state
+
+
+def state_to_seed(state, length):
+    """
+    Opération inverse de `seed_to_state`.
+
+    :param state: État entier du LFSR.
+    :param length: Longueur du registre en bits.
+    :return: L'état sous forme de liste de bits.
+    """
+    return [(state >> i) & 1 for i in range(length)]
+
+
+def taps_to_mask(taps):
+    """
+    Calcule le masque des robinets : le bit `tap - 1` est positionné pour chaque robinet.
+    Un robinet répété s'annule, comme dans la somme modulo 2 de `lfsr`.
+
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+    :return: Le masque des robinets sous forme d'entier.
+    """
+    mask = 0
+    for tap in taps:
+        mask ^= 1 << (tap - 1)
+    return mask
+
+
+def characteristic_poly(length, taps):
+    """
+    Polynôme caractéristique x^L + somme des x^(L - tap) : la suite de sortie vérifie
+    s(n + L) = somme des s(n + L - tap).
+
+    :param length: Longueur L du registre.
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+    :return: Le polynôme sous forme d'entier.
+    """
+    poly = 1 << length
+    for tap in taps:
+        poly ^= 1 << (length - tap)
+    return poly
+
+
+def pack_bits(bits):
+    """
+    Regroupe une liste de bits en octets, le premier bit étant le bit de poids fort du premier octet.
+    Le dernier octet est complété par des zéros.
+
+    :param bits: Liste de bits.
+    :return: Les bits regroupés sous forme de `bytes`.
+    """
+    n = len(bits)
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bit
+    padding = -n % 8
+    return (value << padding).to_bytes((n + padding) // 8, 'big')
+
+
+def unpack_bits(data, length=None):
+    """
+    Opération inverse de `pack_bits`.
+
+    :param data: Octets à décomposer.
+    :param length: Nombre de bits à conserver (par défaut, tous les bits de `data`).
+    :return: La liste de bits.
+    """
+    if length is None:
+        length = 8 * len(data)
+    value = int.from_bytes(data, 'big') >> (8 * len(data) - length)
+    return [(value >> (length - 1 - i)) & 1 for i in range(length)]
+
+
+class LFSREngine:
+    """
+    LFSR dont l'état tient dans un seul entier, produisant sa sortie par octets.
+
+    L'état, lu comme un nombre binaire de L bits, est exactement la suite des L prochains
+    bits de sortie. Un pas consiste donc à extraire le bit de poids fort, puis à insérer
+    en poids faible la parité de `état & masque_des_robinets`.
+
+    Pour la génération en masse, on utilise le polynôme de rétroaction élevé à la puissance
+    2^j (C(x)^(2^j) = C(x^(2^j)) sur GF(2)) : les robinets sont multipliés par 2^j jusqu'à ce
+    que le plus petit dépasse 64, ce qui permet de calculer 64 nouveaux bits d'un coup par
+    un XOR de quelques décalages d'une fenêtre de L * 2^j bits.
+    """
+
+    __slots__ = ("length", "taps", "tap_mask", "mask", "state", "charpoly", "_word_taps", "_window_bits")
+
+    def __init__(self, seed, taps):
+        """
+        :param seed: État initial du LFSR (liste de bits), comme pour `lfsr`.
+        :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+        """
+        if any(tap < 1 or tap > len(seed) for tap in taps):
+            raise ValueError("Les robinets doivent être compris entre 1 et la longueur du registre.")
+        self.length = len(seed)
+        self.tap_mask = taps_to_mask(taps)
+        self.taps = [i + 1 for i in range(self.length) if (self.tap_mask >> i) & 1]
+        self.mask = (1 << self.length) - 1
+        self.state = seed_to_state(seed)
+        self.charpoly = characteristic_poly(self.length, self.taps)
+
+        # Robinets « décimés » pour la génération par mots de 64 bits.
+        scale = 1
+        smallest = self.taps[0] if self.taps else self.length
+        while smallest * scale < WORD_BITS:
+            scale *= 2
+        self._word_taps = [tap * scale for tap in self.taps]
+        self._window_bits = self.length * scale
+
+    @property
+    def seed(self):
+        """État courant sous forme de liste de bits."""
+        return state_to_seed(self.state, self.length)
+
+    def copy(self):
+        """
+        :return: Une copie indépendante du registre, dans le même état.
+        """
+        other = object.__new__(LFSREngine)
+        for name in LFSREngine.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def step(self):
+        """
+        Avance le registre d'un pas.
+
+        :return: Le bit de sortie.
+        """
+        state = self.state
+        out_bit = state >> (self.length - 1)
+        feedback_bit = (state & self.tap_mask).bit_count() & 1
+        self.state = ((state << 1) | feedback_bit) & self.mask
+        return out_bit
+
+    def bits(self, length):
+        """
+        Génère `length` bits, dans le même ordre que `lfsr`.
+
+        :param length: Nombre de bits à générer.
+        :return: Une liste de bits.
+        """
+        return unpack_bits(self.read_bits(length), length)
+
+    def read_bits(self, length):
+        """
+        Génère `length` bits regroupés en octets (voir `pack_bits` pour l'ordre des bits).
+
+        :param length: Nombre de bits à générer.
+        :return: Les bits générés sous forme de `bytes`.
+        """
+        words, rest = divmod(length, WORD_BITS)
+        out = bytearray()
+        if words:
+            out += self._read_words(words)
+        if rest:
+            value = 0
+            for _ in range(rest):
+                value = (value << 1) | self.step()
+            padding = -rest % 8
+            out += (value << padding).to_bytes((rest + padding) // 8, 'big')
+        return bytes(out)
+
+    def read_bytes(self, n_bytes):
+        """
+        Génère `8 * n_bytes` bits de sortie.
+
+        :param n_bytes: Nombre d'octets à générer.
+        :return: Les octets générés.
+        """
+        return self.read_bits(8 * n_bytes)
+
+    def jump(self, steps):
+        """
+        Avance le registre de `steps` pas sans générer les bits intermédiaires, en O(L^2 log steps).
+
+        Si x^steps mod P(x) = somme des c_i x^i (P étant le polynôme caractéristique),
+        alors s(n + steps) = somme des c_i s(n + i) : les L bits du nouvel état s'obtiennent
+        par parité à partir des 2L - 1 prochains bits de sortie.
+
+        :param steps: Nombre de pas (entier positif).
+        :return: Le registre lui-même.
+        """
+        if steps < 0:
+            raise ValueError("Le nombre de pas doit être positif.")
+        length = self.length
+        if steps < 2 * length:
+            # Pour un petit saut, le pas à pas est plus rapide que l'exponentiation.
+            for _ in range(steps):
+                self.step()
+            return self
+        self._apply_jump(poly_powmod(2, steps, self.charpoly))
+        return self
+
+    def jumped(self, steps):
+        """
+        :param steps: Nombre de pas.
+        :return: Une copie du registre avancée de `steps` pas.
+        """
+        return self.copy().jump(steps)
+
+    def bit_at(self, offset):
+        """
+        Renvoie le bit de sortie situé `offset` positions plus loin, sans modifier le registre.
+
+        :param offset: Position du bit, 0 désignant le prochain bit de sortie.
+        :return: Le bit demandé.
+        """
+        return self.jumped(offset).state >> (self.length - 1)
+
+    def byte_at(self, index):
+        """
+        Renvoie l'octet numéro `index` du flot (bits 8 * index à 8 * index + 7), sans modifier le registre.
+
+        :param index: Position de l'octet, 0 désignant le prochain octet.
+        :return: L'octet demandé, sous forme d'entier.
+        """
+        return self.jumped(8 * index).read_bits(8)[0]
+
+    def _apply_jump(self, coefficients):
+        """
+        Applique un saut décrit par les coefficients de x^steps mod P(x).
+
+        :param coefficients: Polynôme x^steps mod P(x) sous forme d'entier.
+        """
+        length = self.length
+        window = self._future_bits(2 * length - 1)
+        state = 0
+        for k in range(length):
+            state = (state << 1) | ((coefficients & (window >> k)).bit_count() & 1)
+        self.state = state
+
+    def _future_bits(self, count):
+        """
+        Prolonge l'état pour obtenir les `count` prochains bits de sortie (`count` >= L).
+
+        :param count: Nombre de bits voulus.
+        :return: Un entier dont le bit i est le bit de sortie numéro i (poids faible en premier).
+        """
+        window = self.state
+        tap_mask = self.tap_mask
+        for _ in range(count - self.length):
+            window = (window << 1) | ((window & tap_mask).bit_count() & 1)
+        return int(format(window, f'0{count}b')[::-1], 2)
+
+    def _read_words(self, words):
+        """
+        Génère `words` mots de 64 bits à l'aide de la fenêtre décimée.
+
+        :param words: Nombre de mots de 64 bits.
+        :return: Un `bytearray` de `8 * words` octets.
+        """
+        length = self.length
+        window_bits = self._window_bits
+        tap_mask = self.tap_mask
+
+        # Fenêtre des `window_bits` prochains bits de sortie, obtenue en prolongeant l'état.
+        window = self.state
+        for _ in range(window_bits - length):
+            window = (window << 1) | ((window & tap_mask).bit_count() & 1)
+
+        shifts = [tap - WORD_BITS for tap in self._word_taps]
+        out_shift = window_bits - WORD_BITS
+        window_mask = (1 << window_bits) - 1
+        to_bytes = int.to_bytes
+        out = bytearray()
+        for _ in range(words):
+            new_word = 0
+            for shift in shifts:
+                new_word ^= window >> shift
+            out += to_bytes(window >> out_shift, 8, 'big')
+            window = ((window << WORD_BITS) | (new_word & WORD_MASK)) & window_mask
+
+        self.state = window >> (window_bits - length)
+        return out
+
+
+def lfsr_bytes(seed, taps, length):
+    """
+    Équivalent de `lfsr(seed, taps, length)` renvoyant les bits regroupés en octets.
+
+    :param seed: État initial du LFSR (liste de bits).
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+    :param length: Nombre de bits à générer.
+    :return: Les bits générés sous forme de `bytes` (premier bit en poids fort).
+    """
+    return LFSREngine(seed, taps).read_bits(length)
+
+
+def lfsr_chunks(seed, taps, chunk_bits, count):
+    """
+    Découpe le flot de `lfsr(seed, taps, ...)` en `count` morceaux indépendants de `chunk_bits` bits.
+    Chaque registre renvoyé est positionné au début de son morceau et peut être utilisé
+    séparément (par exemple dans un autre processus).
+
+    :param seed: État initial du LFSR (liste de bits).
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+    :param chunk_bits: Taille de chaque morceau en bits.
+    :param count: Nombre de morceaux.
+    :return: La liste des registres, le i-ème commençant au bit i * chunk_bits.
+    """
+    if count <= 0:
+        return []
+    engines = [LFSREngine(seed, taps)]
+    # Le même saut est appliqué à chaque morceau : x^chunk_bits mod P(x) n'est calculé qu'une fois.
+    coefficients = poly_powmod(2, chunk_bits, engines[0].charpoly)
+    for _ in range(count - 1):
+        engine = engines[-1].copy()
+        engine._apply_jump(coefficients)
+        engines.append(engine)
+    return engines
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation et vérification par rapport à `lfsr`.
+    import time
+
+    seed = [1, 1, 1, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 1, 0, 0]
+    taps = [16, 14, 13, 11]
+    reference = lfsr(seed, taps, 1000)
+    assert unpack_bits(lfsr_bytes(seed, taps, 1000), 1000) == reference
+    print("The LFSR sequence is:")
+    print(LFSREngine(seed, taps).bits(32))
+
+    start = time.perf_counter()
+    keystream = lfsr_bytes(seed, taps, 8 * 1024 * 1024)
+    print(f"1 Mio de flot généré en {time.perf_counter() - start:.3f} s")
+
+    # Accès direct et découpage du flot en morceaux indépendants.
+    engine = LFSREngine(seed, taps)
+    assert engine.bit_at(999) == reference[999]
+    chunks = lfsr_chunks(seed, taps, 250, 4)
+    assert sum((chunk.bits(250) for chunk in chunks), []) == reference
@@ -0,0 +1,276 @@
+import json
+import math
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from berlekamp import BerlekampMassey
+
+ALPHA = 0.01
+BLOCK_BITS = 1 << 20
+TESTS = ("frequency", "runs", "linear_complexity", "spectral", "serial_1", "serial_2")
+
+# Probabilités des 7 classes de la statistique T du test de complexité linéaire (SP 800-22, 2.10).
+LINEAR_COMPLEXITY_PROBABILITIES = (0.010417, 0.03125, 0.125, 0.5, 0.25, 0.0625, 0.020833)
+
+
+def igamc(a, x):
+    """
+    Fonction gamma incomplète supérieure régularisée Q(a, x), utilisée pour les p-valeurs du χ².
+    Calculée par son développement en série si x < a + 1, par fraction continue (Lentz) sinon.
+
+    :param a: Paramètre strictement positif.
+    :param x: Borne inférieure de l'intégrale (positive).
+    :return: Q(a, x).
+    """
+    if x <= 0:
+        return 1.0
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        ap = a
+        while abs(term) > abs(total) * 1e-15:
+            ap += 1
+            term *= x / ap
+            total += term
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    i = 0
+    while True:
+        i += 1
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefactor) * h
+
+
+def frequency_test(bits):
+    """
+    Test de fréquence (monobit) : la proportion de 1 doit être proche de 1/2.
+
+    :param bits: Tableau NumPy de bits.
+    :return: La p-valeur.
+    """
+    n = bits.size
+    s = 2 * int(np.count_nonzero(bits)) - n
+    return math.erfc(abs(s) / math.sqrt(2 * n))
+
+
+def runs_test(bits):
+    """
+    Test des suites : le nombre de suites de bits identiques doit correspondre à celui d'une suite aléatoire.
+
+    :param bits: Tableau NumPy de bits.
+    :return: La p-valeur (0 si le test de fréquence préalable échoue).
+    """
+    n = bits.size
+    pi = np.count_nonzero(bits) / n
+    if abs(pi - 0.5) >= 2 / math.sqrt(n):
+        return 0.0
+    runs = 1 + int(np.count_nonzero(bits[1:] != bits[:-1]))
+    expected = 2 * n * pi * (1 - pi)
+    return math.erfc(abs(runs - expected) / (2 * math.sqrt(2 * n) * pi * (1 - pi)))
+
+
+def linear_complexity_test(bits, block_size=500):
+    """
+    Test de complexité linéaire : la complexité de chaque sous-bloc de `block_size` bits,
+    calculée par Berlekamp-Massey, doit se répartir comme pour une suite aléatoire.
+
+    :param bits: Tableau NumPy de bits.
+    :param block_size: Taille M des sous-blocs (entre 500 et 5000).
+    :return: La p-valeur.
+    """
+    n_blocks = bits.size // block_size
+    m = block_size
+    mu = m / 2 + (9 + (-1) ** (m + 1)) / 36 - (m / 3 + 2 / 9) / 2 ** m
+    counts = [0] * 7
+    for i in range(n_blocks):
+        block = bits[i * m:(i + 1) * m].tolist()
+        complexity = BerlekampMassey().update(block).linear_complexity
+        t = (-1) ** m * (complexity - mu) + 2 / 9
+        counts[min(6, max(0, math.ceil(t + 2.5)))] += 1
+    chi2 = sum((count - n_blocks * p) ** 2 / (n_blocks * p)
+               for count, p in zip(counts, LINEAR_COMPLEXITY_PROBABILITIES))
+    return igamc(3, chi2 / 2)
+
+
+def spectral_test(bits):
+    """
+    Test spectral (transformée de Fourier discrète) : on ne doit pas trouver de pics périodiques
+    dépassant le seuil des 95 %.
+
+    :param bits: Tableau NumPy de bits.
+    :return: La p-valeur.
+    """
+    n = bits.size
+    x = 2.0 * bits - 1.0
+    modulus = np.abs(np.fft.rfft(x)[:n // 2])
+    threshold = math.sqrt(math.log(1 / 0.05) * n)
+    expected = 0.95 * n / 2
+    observed = int(np.count_nonzero(modulus < threshold))
+    d = (observed - expected) / math.sqrt(n * 0.95 * 0.05 / 4)
+    return math.erfc(abs(d) / math.sqrt(2))
+
+
+def _psi_squared(bits, m):
+    """
+    Statistique ψ²_m du test sériel, sur les motifs de m bits avec recouvrement (la suite étant
+    prolongée circulairement par ses m - 1 premiers bits).
+
+    :param bits: Tableau NumPy de bits.
+    :param m: Longueur des motifs.
+    :return: ψ²_m.
+    """
+    if m <= 0:
+        return 0.0
+    n = bits.size
+    extended = np.concatenate((bits, bits[:m - 1])).astype(np.int64)
+    patterns = np.zeros(n, dtype=np.int64)
+    for k in range(m):
+        patterns = (patterns << 1) | extended[k:k + n]
+    counts = np.bincount(patterns, minlength=1 << m).astype(np.float64)
+    return float((1 << m) / n * np.dot(counts, counts) - n)
+
+
+def serial_test(bits, m=16):
+    """
+    Test sériel : tous les motifs de m bits doivent apparaître avec la même fréquence.
+    La longueur m est réduite si nécessaire pour respecter m < log2(n) - 2.
+
+    :param bits: Tableau NumPy de bits.
+    :param m: Longueur des motifs.
+    :return: Les deux p-valeurs (∇ψ²_m et ∇²ψ²_m).
+    """
+    m = max(3, min(m, int(math.log2(bits.size)) - 3))
+    psi_m, psi_m1, psi_m2 = (_psi_squared(bits, k) for k in (m, m - 1, m - 2))
+    delta1 = psi_m - psi_m1
+    delta2 = psi_m - 2 * psi_m1 + psi_m2
+    return igamc(2 ** (m - 2), delta1 / 2), igamc(2 ** (m - 3), delta2 / 2)
+
+
+def block_tests(path, offset, n_bytes):
+    """
+    Exécute tous les tests sur un bloc du fichier. Le bloc est lu par projection mémoire dans le
+    processus de travail : seuls le chemin et la position transitent entre processus.
+
+    :param path: Chemin du fichier binaire.
+    :param offset: Position du bloc en octets.
+    :param n_bytes: Taille du bloc en octets.
+    :return: Dictionnaire {nom du test: p-valeur}.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bits = np.unpackbits(np.frombuffer(mm[offset:offset + n_bytes], dtype=np.uint8))
+    serial_1, serial_2 = serial_test(bits)
+    return {
+        "frequency": frequency_test(bits),
+        "runs": runs_test(bits),
+        "linear_complexity": linear_complexity_test(bits),
+        "spectral": spectral_test(bits),
+        "serial_1": serial_1,
+        "serial_2": serial_2,
+    }
+
+
+def uniformity(p_values):
+    """
+    Uniformité des p-valeurs (SP 800-22, 4.2.2) : χ² sur 10 classes de même largeur.
+
+    :param p_values: Liste de p-valeurs.
+    :return: La p-valeur de l'uniformité.
+    """
+    s = len(p_values)
+    counts = np.histogram(p_values, bins=10, range=(0.0, 1.0))[0]
+    chi2 = float(np.sum((counts - s / 10) ** 2 / (s / 10)))
+    return igamc(4.5, chi2 / 2)
+
+
+def run_battery(path, block_bits=BLOCK_BITS, workers=None, report_path=None):
+    """
+    Exécute la batterie de tests sur un fichier binaire (bits lus du poids fort au poids faible),
+    découpé en blocs de `block_bits` bits testés indépendamment sur un ensemble de processus.
+    Un bloc final incomplet est ignoré.
+
+    :param path: Chemin du fichier binaire.
+    :param block_bits: Taille des blocs en bits (multiple de 8).
+    :param workers: Nombre de processus (par défaut, le nombre de cœurs).
+    :param report_path: Si fourni, chemin du rapport JSON à écrire.
+    :return: Le rapport sous forme de dictionnaire.
+    """
+    block_bytes = block_bits // 8
+    n_blocks = os.path.getsize(path) // block_bytes
+    if n_blocks == 0:
+        raise ValueError("Le fichier est plus petit qu'un bloc.")
+    offsets = [i * block_bytes for i in range(n_blocks)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(partial(block_tests, path, n_bytes=block_bytes), offsets))
+
+    report = {
+        "file": os.path.abspath(path),
+        "block_bits": block_bits,
+        "blocks": n_blocks,
+        "alpha": ALPHA,
+        "tests": {},
+    }
+    for name in TESTS:
+        p_values = [result[name] for result in results]
+        report["tests"][name] = {
+            "proportion": sum(p >= ALPHA for p in p_values) / n_blocks,
+            "uniformity": uniformity(p_values),
+            "p_values": p_values,
+        }
+    if report_path is not None:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=1)
+    return report
+
+
+def print_summary(report):
+    """
+    Affiche la proportion de blocs réussis et l'uniformité des p-valeurs pour chaque test.
+
+    :param report: Rapport renvoyé par `run_battery`.
+    """
+    print(f"{report['file']} : {report['blocks']} blocs de {report['block_bits']} bits")
+    for name, result in report["tests"].items():
+        print(f"{name:20s} proportion = {result['proportion']:.3f}\tuniformité = {result['uniformity']:.4f}")
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : comparaison d'un LFSR à période maximale et de `random.getrandbits`.
+    import random
+    import sys
+    import tempfile
+    from lfsr_engine import lfsr_bytes
+    from primitive import maximal_taps
+
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            print_summary(run_battery(path, report_path=path + ".report.json"))
+        sys.exit()
+
+    n_bytes = 16 * BLOCK_BITS // 8
+    with tempfile.TemporaryDirectory() as directory:
+        lfsr_path = os.path.join(directory, "lfsr.bin")
+        with open(lfsr_path, 'wb') as f:
+            f.write(lfsr_bytes([1] + [0] * 63, maximal_taps(64), 8 * n_bytes))
+        random_path = os.path.join(directory, "getrandbits.bin")
+        with open(random_path, 'wb') as f:
+            f.write(random.getrandbits(8 * n_bytes).to_bytes(n_bytes, 'big'))
+        for path in (lfsr_path, random_path):
+            print_summary(run_battery(path))
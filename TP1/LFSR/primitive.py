@@ -0,0 +1,266 @@
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+from math import gcd
+
+from gf2_poly import poly_powmod
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "primitive_taps.json")
+MAX_DEGREE = 64
+
+
+def is_probable_prime(n):
+    """
+    Test de primalité de Miller-Rabin, déterministe pour n < 3.3 * 10^24.
+
+    :param n: Entier à tester.
+    :return: True si n est premier.
+    """
+    if n < 2:
+        return False
+    small_primes = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for p in small_primes:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in small_primes:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(n):
+    """
+    Trouve un facteur non trivial d'un entier composé par la méthode rho de Pollard (variante de Brent).
+
+    :param n: Entier composé.
+    :return: Un diviseur strict de n.
+    """
+    if n % 2 == 0:
+        return 2
+    while True:
+        c = random.randrange(1, n)
+        y = x = random.randrange(2, n)
+        d = 1
+        while d == 1:
+            x = (x * x + c) % n
+            y = (y * y + c) % n
+            y = (y * y + c) % n
+            d = gcd(abs(x - y), n)
+        if d != n:
+            return d
+
+
+@lru_cache(maxsize=None)
+def prime_factors(n):
+    """
+    :param n: Entier strictement positif.
+    :return: La liste triée des facteurs premiers distincts de n.
+    """
+    factors = set()
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if is_probable_prime(m):
+            factors.add(m)
+            continue
+        d = pollard_rho(m)
+        stack.extend((d, m // d))
+    return sorted(factors)
+
+
+def taps_to_poly(taps):
+    """
+    Polynôme de connexion 1 + somme des x^tap associé aux robinets de `lfsr`.
+
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+    :return: Le polynôme sous forme d'entier.
+    """
+    poly = 1
+    for tap in taps:
+        poly ^= 1 << tap
+    return poly
+
+
+def poly_to_taps(poly):
+    """
+    Opération inverse de `taps_to_poly`.
+
+    :param poly: Polynôme de connexion sous forme d'entier.
+    :return: Les robinets, par ordre décroissant (comme dans `taps = [16, 14, 13, 11]`).
+    """
+    return [i for i in range(poly.bit_length() - 1, 0, -1) if (poly >> i) & 1]
+
+
+def is_primitive(poly):
+    """
+    Teste si un polynôme de degré L est primitif, c'est-à-dire si l'ordre de x modulo ce polynôme
+    est exactement 2^L - 1 : x^(2^L - 1) = 1 et x^((2^L - 1) / q) != 1 pour chaque facteur premier q
+    de 2^L - 1. Un LFSR dont le polynôme de connexion est primitif a une période maximale.
+
+    :param poly: Polynôme sous forme d'entier.
+    :return: True si le polynôme est primitif.
+    """
+    degree = poly.bit_length() - 1
+    if degree < 1 or not poly & 1:
+        return False
+    order = (1 << degree) - 1
+    if poly_powmod(2, order, poly) != 1:
+        return False
+    return all(poly_powmod(2, order // q, poly) != 1 for q in prime_factors(order))
+
+
+def candidate_polys(degree, max_weight=5):
+    """
+    Énumère les polynômes de connexion de degré `degree`, par nombre de termes croissant
+    (trinômes, pentanômes, ...) : les polynômes creux donnent des LFSR à peu de robinets.
+    Seuls les nombres impairs de termes sont énumérés, les autres étant divisibles par x + 1.
+
+    :param degree: Degré L des polynômes.
+    :param max_weight: Nombre maximal de termes.
+    :return: Un générateur de polynômes sous forme d'entiers.
+    """
+    base = 1 | (1 << degree)
+    if degree == 1:
+        yield base
+        return
+    for middle_terms in range(1, max_weight - 1, 2):
+        for exponents in combinations(range(1, degree), middle_terms):
+            poly = base
+            for e in exponents:
+                poly |= 1 << e
+            yield poly
+
+
+def _primitive_in(polys):
+    """
+    Tâche exécutée par les processus de travail.
+
+    :param polys: Liste de polynômes candidats.
+    :return: Ceux qui sont primitifs.
+    """
+    return [poly for poly in polys if is_primitive(poly)]
+
+
+def search_primitive(degree, limit=4, max_weight=5, workers=None, batch_size=64):
+    """
+    Recherche des polynômes primitifs de degré donné, en répartissant les candidats sur un
+    ensemble de processus.
+
+    :param degree: Degré L recherché.
+    :param limit: Nombre de polynômes primitifs voulus.
+    :param max_weight: Nombre maximal de termes des candidats.
+    :param workers: Nombre de processus (par défaut, le nombre de cœurs).
+    :param batch_size: Nombre de candidats par tâche.
+    :return: Les robinets des polynômes trouvés, dans l'ordre d'énumération.
+    """
+    candidates = list(candidate_polys(degree, max_weight))
+    batches = [candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)]
+    found = []
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # `map` conserve l'ordre des lots : le résultat ne dépend pas du nombre de processus.
+        for primitive in pool.map(_primitive_in, batches):
+            found.extend(primitive)
+            if len(found) >= limit:
+                break
+    finally:
+        # Les lots restants sont abandonnés dès que suffisamment de polynômes ont été trouvés.
+        pool.shutdown(cancel_futures=True)
+    return [poly_to_taps(poly) for poly in found[:limit]]
+
+
+def build_table(max_degree=MAX_DEGREE, limit=4, path=TABLE_PATH, workers=None):
+    """
+    Construit la table des robinets à période maximale pour tous les degrés de 1 à `max_degree`
+    et l'écrit sur le disque au format JSON.
+
+    :param max_degree: Degré maximal.
+    :param limit: Nombre de polynômes par degré.
+    :param path: Chemin du fichier de cache.
+    :param workers: Nombre de processus.
+    :return: La table {degré: liste de robinets}.
+    """
+    table = _load_table(path)
+    for degree in range(1, max_degree + 1):
+        if len(table.get(degree, [])) < limit:
+            table[degree] = search_primitive(degree, limit, workers=workers)
+    _save_table(table, path)
+    return table
+
+
+def maximal_taps(degree, path=TABLE_PATH):
+    """
+    Renvoie des robinets donnant une période maximale 2^L - 1 pour un LFSR de longueur `degree`.
+    La valeur est lue dans la table en cache ; si le degré en est absent, elle est calculée puis ajoutée.
+
+    :param degree: Longueur L du registre.
+    :param path: Chemin du fichier de cache.
+    :return: Les robinets, utilisables directement avec `lfsr`.
+    """
+    table = _load_table(path)
+    if not table.get(degree):
+        table[degree] = search_primitive(degree, limit=1)
+        _save_table(table, path)
+    return table[degree][0]
+
+
+def _load_table(path):
+    """
+    :param path: Chemin du fichier de cache.
+    :return: La table lue, ou une table vide si le fichier n'existe pas.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {int(degree): taps for degree, taps in json.load(f).items()}
+
+
+def _save_table(table, path):
+    """
+    Écrit la table sur le disque.
+
+    :param table: Table {degré: liste de robinets}.
+    :param path: Chemin du fichier de cache.
+    """
+    lines = [f'  "{degree}": {json.dumps(table[degree])}' for degree in sorted(table)]
+    with open(path, 'w') as f:
+        f.write("{\n" + ",\n".join(lines) + "\n}\n")
+
+
+if __name__ == "__main__":
+    # Construction (ou complétion) de la table puis vérification de la période pour les petits degrés.
+    import time
+    from lfsr_engine import LFSREngine
+
+    start = time.perf_counter()
+    table = build_table()
+    print(f"Table des degrés 1 à {MAX_DEGREE} prête en {time.perf_counter() - start:.2f} s")
+    print("Robinets pour L = 16 :", maximal_taps(16))
+    print("Robinets pour L = 64 :", maximal_taps(64))
+
+    for degree in range(2, 13):
+        taps = maximal_taps(degree)
+        engine = LFSREngine([1] + [0] * (degree - 1), taps)
+        initial = engine.state
+        period = 1
+        engine.step()
+        while engine.state != initial:
+            engine.step()
+            period += 1
+        assert period == (1 << degree) - 1, (degree, taps, period)
@@ -0,0 +1,136 @@
+import time
+
+from gf2_poly import poly_mulmod, poly_powmod
+from lfsr_engine import characteristic_poly
+
+
+def output_equations(register_length, taps, positions):
+    """
+    Construit, pour chaque position t, la ligne du système linéaire reliant s(t) aux L premiers
+    bits de sortie : si x^t mod P(x) = somme des c_i x^i, alors s(t) = somme des c_i s(i).
+    Les lignes successives s'obtiennent en multipliant par x (matrice compagnon), ou par
+    x^écart pour les positions éloignées.
+
+    :param register_length: Longueur L du registre.
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+    :param positions: Positions croissantes des bits connus.
+    :return: Liste des lignes, le bit i de chaque ligne étant le coefficient c_i.
+    """
+    charpoly = characteristic_poly(register_length, taps)
+    top = 1 << register_length
+    rows = []
+    row = None
+    previous = 0
+    for position in positions:
+        gap = position - previous
+        if row is None:
+            row = poly_powmod(2, position, charpoly)
+        elif gap < register_length:
+            for _ in range(gap):
+                row <<= 1
+                if row & top:
+                    row ^= charpoly
+        else:
+            row = poly_mulmod(row, poly_powmod(2, gap, charpoly), charpoly)
+        rows.append(row)
+        previous = position
+    return rows
+
+
+def solve_gf2(rows, values, n_unknowns):
+    """
+    Résout un système linéaire sur GF(2) par élimination de Gauss-Jordan, chaque ligne étant
+    un entier (le bit `n_unknowns` contenant le second membre) et chaque opération un XOR de lignes.
+
+    :param rows: Coefficients des équations (le bit i est le coefficient de l'inconnue i).
+    :param values: Seconds membres (bits).
+    :param n_unknowns: Nombre d'inconnues.
+    :return: Un couple (solution, opérations) : la solution sous forme d'entier et le nombre de XOR de lignes.
+    """
+    augmented = [row | (value << n_unknowns) for row, value in zip(rows, values)]
+    rhs_bit = 1 << n_unknowns
+    pivots = []
+    operations = 0
+    for column in range(n_unknowns):
+        bit = 1 << column
+        pivot_index = next((i for i in range(len(pivots), len(augmented)) if augmented[i] & bit), None)
+        if pivot_index is None:
+            raise ValueError(f"Système sous-déterminé : l'inconnue {column} n'est pas fixée par les bits connus.")
+        rank = len(pivots)
+        augmented[rank], augmented[pivot_index] = augmented[pivot_index], augmented[rank]
+        pivot = augmented[rank]
+        for i, row in enumerate(augmented):
+            if i != rank and row & bit:
+                augmented[i] = row ^ pivot
+                operations += 1
+        pivots.append(column)
+
+    # Les équations surnuméraires doivent être réduites à 0 = 0.
+    if any(row == rhs_bit for row in augmented[n_unknowns:]):
+        raise ValueError("Système incohérent : les bits connus ne proviennent pas de ce LFSR.")
+    solution = 0
+    for column in range(n_unknowns):
+        if augmented[column] & rhs_bit:
+            solution |= 1 << column
+    return solution, operations
+
+
+def recover_seed(keystream, register_length, taps, offset=0, positions=None):
+    """
+    Retrouve l'état initial d'un LFSR de robinets connus à partir de bits de sortie connus.
+
+    :param keystream: Bits de sortie connus (liste de bits).
+    :param register_length: Longueur L du registre.
+    :param taps: Positions pour l'opération XOR, indexées à partir de 1.
+    :param offset: Position du premier bit de `keystream` dans la sortie de `lfsr` (si `positions` est absent).
+    :param positions: Position de chaque bit de `keystream` dans la sortie de `lfsr`.
+    :return: Un couple (seed, compteurs) : l'état initial utilisable avec `lfsr`, et un dictionnaire
+             donnant les temps de construction et de résolution du système et le nombre de XOR de lignes.
+    """
+    if positions is None:
+        positions = range(offset, offset + len(keystream))
+    known = sorted(zip(positions, keystream))
+
+    start = time.perf_counter()
+    rows = output_equations(register_length, taps, [position for position, _ in known])
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solution, operations = solve_gf2(rows, [bit for _, bit in known], register_length)
+    solve_time = time.perf_counter() - start
+
+    # L'inconnue i est s(i), c'est-à-dire la case L - 1 - i de l'état initial.
+    seed = [(solution >> (register_length - 1 - j)) & 1 for j in range(register_length)]
+    counters = {
+        "equations": len(rows),
+        "build_time": build_time,
+        "solve_time": solve_time,
+        "row_operations": operations,
+    }
+    return seed, counters
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : état d'un registre de 2048 bits retrouvé à partir d'un extrait de son flot.
+    import random
+    from lfsr_engine import LFSREngine
+    from primitive import maximal_taps
+
+    register_length = 2048
+    taps = [2048, 2035, 2034, 2029]
+    seed = [random.getrandbits(1) for _ in range(register_length)]
+    offset = 10 ** 6
+    keystream = LFSREngine(seed, taps).jumped(offset).bits(register_length + 16)
+
+    recovered, counters = recover_seed(keystream, register_length, taps, offset=offset)
+    print("État retrouvé :", recovered == seed)
+    print(counters)
+
+    # Vérification de cohérence : un flot altéré est rejeté.
+    taps = maximal_taps(16)
+    keystream = LFSREngine(seed[:16], taps).bits(40)
+    keystream[30] ^= 1
+    try:
+        recover_seed(keystream, 16, taps)
+    except ValueError as error:
+        print(error)
@@ -1,6 +1,8 @@
 import numpy as np
 import binascii
 
+import gf256
+
 # Partie 1 :
 
 Sbox = (
@@ -43,22 +45,8 @@ def mixColumns(a) :
         [0x01, 0x01, 0x02, 0x03],
         [0x03, 0x01, 0x01, 0x02]
     ], dtype=np.uint8)
-    a_transpose = np.array(a, dtype=np.uint8).T
-    result = np.zeros_like(a_transpose)
-    for i in range(4):
-        for j in range(4):
-            s = 0
-            for k in range(4):
-                x = X[j][k]
-                v = a_transpose[i][k]
-                for bit in range(8):
-                    if x & (1 << bit):
-                        s ^= v << bit
-                        s ^= (0x11b if (s & 0x100) else 0x00)
-            # Only the lower 8 bits are of interest after the modulo operation
-            result[i][j] = s & 0xff
-    result_transposed = result.T
-    return result_transposed
+    # Produit matriciel dans GF(2^8), par la table de multiplication de gf256
+    return gf256.matrix_multiply(X, a)
 
 # Création des clés pour les ajouter par la suite durant les étapes du cryptage
 def key_expansion(key, Sbox, rc):
@@ -174,18 +162,6 @@ def inv_shiftrows(state):
 
 # Fonction qui effectue l'inverse de MixColumns
 def invMixColumns(a):
-    def gf_mul(x, y): # Multiplie deux nombres en GF(2^8)
-        result = 0
-        for i in range(8):
-            if y & 1:
-                result ^= x
-            carry = x & 0x80
-            x <<= 1
-            if carry:
-                x ^= 0x11b
-            y >>= 1
-        return result
-
 # Inverse de la matrice de mixcolumns
     X_inv = np.array([
         [0x0e, 0x0b, 0x0d, 0x09],
@@ -194,20 +170,7 @@ def invMixColumns(a):
         [0x0b, 0x0d, 0x09, 0x0e]
     ], dtype=np.uint8)
 
-    a_transpose = np.array(a, dtype=np.uint8).T
-    result = np.zeros_like(a_transpose)
-
-    for i in range(4):
-        for j in range(4):
-            s = 0
-            for k in range(4):
-                x = X_inv[j][k]
-                v = a_transpose[i][k]
-                s ^= gf_mul(x, v)
-            result[i][j] = s & 0xff
-
-    result_transposed = result.T
-    return result_transposed.tolist()
+    return gf256.matrix_multiply(X_inv, a).tolist()
 
 
 # Fonction qui effectue le decryptage complet
@@ -225,10 +188,11 @@ def complete_decryption(state):
     state = add_round_key(state, use_key[0])
     return state
 
-encrypted_state_hex = [[hex(x) for x in row] for row in complete_encryption(state)]
-encrypted_state_hexx = [[hex(x) for x in row] for row in complete_decryption(complete_encryption(state))]
-print(encrypted_state_hexx)
-print(encrypted_state_hex)
+if __name__ == "__main__":
+    encrypted_state_hex = [[hex(x) for x in row] for row in complete_encryption(state)]
+    encrypted_state_hexx = [[hex(x) for x in row] for row in complete_decryption(complete_encryption(state))]
+    print(encrypted_state_hexx)
+    print(encrypted_state_hex)
 
 
 #Partie 3
@@ -273,7 +237,9 @@ def apply_affine_transformation(x):
     return int(''.join(str(int(bit)) for bit in (transformed_bits ^ constant_vector)[::-1]), 2)
 
 def s_box(x):
-    return apply_affine_transformation(inverse_in_gf2_8(x))
+    # Inverse et transformation affine par les tables log/exp de gf256
+    return int(gf256.affine(gf256.gf_inverse(x)))
 
-# Example of using S-box
-print(f"S-box(0x98) = {s_box(0x98):02x}") 
+if __name__ == "__main__":
+    # Example of using S-box
+    print(f"S-box(0x98) = {s_box(0x98):02x}") 
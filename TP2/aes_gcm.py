@@ -0,0 +1,308 @@
+import hmac
+
+import numpy as np
+
+from aes_numpy import BLOCK_SIZE, encrypt_blocks, round_key_array
+from aes_ttable import AES
+
+TAG_SIZE = 16
+# Réduction de GHASH : x^128 = x^7 + x^2 + x + 1, dans l'ordre des bits de GCM (bit 0 en poids fort).
+R = 0xe1 << 120
+# Nombre maximal de blocs de flot de clés calculés ensemble par `GCMCounter`.
+STREAM_BATCH_BLOCKS = 4096
+
+
+def ghash_tables(h):
+    """
+    Tables de multiplication par H de Shoup, sur 8 bits : pour chacune des 16 positions d'octet i
+    et chaque valeur b, tables[i][b] est le produit par H de l'élément formé du seul octet b en
+    position i. Les 128 produits H.x^j sont obtenus par décalages, puis chaque entrée est le XOR
+    d'une entrée déjà calculée et d'un de ces produits.
+
+    :param h: Clé de hachage H, sous forme d'entier de 128 bits.
+    :return: Liste de 16 listes de 256 entiers.
+    """
+    powers = []
+    v = h
+    for _ in range(128):
+        powers.append(v)
+        v = (v >> 1) ^ (R if v & 1 else 0)  # Multiplication par x
+    tables = []
+    for i in range(16):
+        table = [0] * 256
+        for b in range(1, 256):
+            low = b & -b
+            table[b] = table[b ^ low] ^ powers[8 * i + 8 - low.bit_length()]
+        tables.append(table)
+    return tables
+
+
+class GHASH:
+    """
+    Fonction GHASH de GCM calculée au fil de l'eau : chaque bloc de 16 octets coûte 16 lectures
+    de table et des XOR sur des entiers de 128 bits. Seul un reste de moins de 16 octets est conservé.
+    """
+
+    __slots__ = ("tables", "value", "_buffer")
+
+    def __init__(self, h):
+        """
+        :param h: Clé de hachage H (16 octets).
+        """
+        self.tables = ghash_tables(int.from_bytes(h, 'big'))
+        self.value = 0
+        self._buffer = b''
+
+    def update(self, data):
+        """
+        :param data: Octets à ajouter.
+        """
+        if self._buffer:
+            data = self._buffer + bytes(data)
+        view = memoryview(data)
+        full = len(view) - len(view) % 16
+        tables = self.tables
+        y = self.value
+        from_bytes = int.from_bytes
+        for i in range(0, full, 16):
+            z = 0
+            for table, byte in zip(tables, (y ^ from_bytes(view[i:i + 16], 'big')).to_bytes(16, 'big')):
+                z ^= table[byte]
+            y = z
+        self.value = y
+        self._buffer = bytes(view[full:])
+
+    def pad16(self):
+        """
+        Complète les données par des zéros jusqu'à un multiple de 16 octets.
+        """
+        if self._buffer:
+            self.update(bytes(16 - len(self._buffer)))
+
+
+class GCMCounter:
+    """
+    Chiffrement en mode compteur de GCM (incrémentation des 32 bits de poids faible), en flot :
+    le flot de clés est calculé par lots de blocs avec `encrypt_blocks`, et le flot non utilisé
+    du dernier bloc entamé est conservé entre deux appels à `update`.
+    """
+
+    __slots__ = ("round_keys", "prefix", "counter", "_pending")
+
+    def __init__(self, round_keys, initial_counter):
+        """
+        :param round_keys: Clés de round, résultat de `round_key_array`.
+        :param initial_counter: Premier bloc compteur de 16 octets.
+        """
+        self.round_keys = round_keys
+        self.prefix = np.frombuffer(initial_counter[:12], dtype=np.uint8)
+        self.counter = int.from_bytes(initial_counter[12:], 'big')
+        self._pending = b''
+
+    def _blocks(self, count):
+        """
+        :param count: Nombre de blocs.
+        :return: Le flot de clés des `count` blocs suivants, sous forme de tableau uint8.
+        """
+        counters = np.empty((count, BLOCK_SIZE), dtype=np.uint8)
+        counters[:, :12] = self.prefix
+        values = (self.counter + np.arange(count, dtype=np.uint64)) & np.uint64(0xffffffff)
+        counters[:, 12:] = values.astype('>u4').view(np.uint8).reshape(-1, 4)
+        self.counter = (self.counter + count) & 0xffffffff
+        return encrypt_blocks(counters, self.round_keys).reshape(-1)
+
+    def update(self, chunk):
+        """
+        :param chunk: Octets à chiffrer (ou à déchiffrer).
+        :return: Le résultat, de même longueur.
+        """
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        out = np.empty_like(data)
+        pending = np.frombuffer(self._pending, dtype=np.uint8)
+        used = min(pending.size, data.size)
+        np.bitwise_xor(data[:used], pending[:used], out=out[:used])
+        self._pending = self._pending[used:]
+        while used < data.size:
+            count = min(STREAM_BATCH_BLOCKS, (data.size - used + BLOCK_SIZE - 1) // BLOCK_SIZE)
+            key_stream = self._blocks(count)
+            end = min(used + key_stream.size, data.size)
+            np.bitwise_xor(data[used:end], key_stream[:end - used], out=out[used:end])
+            self._pending = key_stream[end - used:].tobytes()
+            used = end
+        return out.tobytes()
+
+
+class _GCMContext:
+    """
+    Partie commune au chiffrement et au déchiffrement AES-GCM (NIST SP 800-38D) : H est le chiffré du
+    bloc nul, le premier bloc compteur J0 est déduit de l'IV, et GHASH est mis à jour au fur et à
+    mesure que le chiffré est produit ou reçu, si bien que les données ne sont parcourues qu'une fois.
+    """
+
+    def __init__(self, key, iv, aad=b''):
+        """
+        :param key: Clé de 16, 24 ou 32 octets.
+        :param iv: Vecteur d'initialisation (12 octets recommandés, à ne jamais réutiliser avec la même clé).
+        :param aad: Données associées, authentifiées mais non chiffrées.
+        """
+        cipher = AES(key)
+        h = cipher.encrypt_block(bytes(16))
+        self.ghash = GHASH(h)
+        if len(iv) == 12:
+            j0 = bytes(iv) + b'\x00\x00\x00\x01'
+        else:
+            iv_hash = GHASH(h)
+            iv_hash.update(iv)
+            iv_hash.pad16()
+            iv_hash.update(bytes(8) + (8 * len(iv)).to_bytes(8, 'big'))
+            j0 = iv_hash.value.to_bytes(16, 'big')
+        self.tag_mask = cipher.encrypt_block(j0)
+        counter = (int.from_bytes(j0[12:], 'big') + 1) & 0xffffffff
+        self.counter = GCMCounter(round_key_array(key), j0[:12] + counter.to_bytes(4, 'big'))
+        self.ghash.update(aad)
+        self.ghash.pad16()
+        self.aad_length = len(aad)
+        self.length = 0
+        self.tag = None  # Étiquette, calculée une seule fois par `finalize`.
+
+    def _check_open(self):
+        """
+        :raises ValueError: Si `finalize` a déjà été appelée.
+        """
+        if self.tag is not None:
+            raise ValueError("Contexte déjà finalisé.")
+
+    def _tag(self):
+        """
+        Termine GHASH (complément et bloc des longueurs) et conserve l'étiquette : appelée une seconde
+        fois, elle renvoie la même étiquette sans rien ajouter à GHASH.
+
+        :return: L'étiquette calculée sur les données associées et le chiffré traités.
+        """
+        if self.tag is not None:
+            return self.tag
+        self.ghash.pad16()
+        self.ghash.update((8 * self.aad_length).to_bytes(8, 'big') + (8 * self.length).to_bytes(8, 'big'))
+        self.tag = bytes(a ^ b for a, b in zip(self.ghash.value.to_bytes(16, 'big'), self.tag_mask))
+        return self.tag
+
+
+class GCMEncryptor(_GCMContext):
+    """
+    Chiffrement authentifié AES-GCM en flot : `update` renvoie le chiffré de chaque morceau
+    et met à jour GHASH, `finalize` renvoie l'étiquette.
+    """
+
+    def update(self, chunk):
+        """
+        :param chunk: Morceau de texte clair.
+        :return: Le chiffré correspondant.
+        """
+        self._check_open()
+        ciphertext = self.counter.update(chunk)
+        self.ghash.update(ciphertext)
+        self.length += len(ciphertext)
+        return ciphertext
+
+    def finalize(self):
+        """
+        :return: L'étiquette d'authentification de 16 octets.
+        :raises ValueError: Si le contexte est déjà finalisé.
+        """
+        self._check_open()
+        return self._tag()
+
+
+class GCMDecryptor(_GCMContext):
+    """
+    Déchiffrement authentifié AES-GCM en flot. Le texte clair renvoyé par `update` ne doit pas
+    être utilisé tant que `finalize` n'a pas vérifié l'étiquette.
+    """
+
+    def update(self, chunk):
+        """
+        :param chunk: Morceau de chiffré.
+        :return: Le texte clair correspondant (non authentifié avant `finalize`).
+        """
+        self._check_open()
+        self.ghash.update(chunk)
+        self.length += len(chunk)
+        return self.counter.update(chunk)
+
+    def finalize(self, tag):
+        """
+        Vérifie l'étiquette, en temps constant.
+
+        :param tag: Étiquette de 16 octets reçue.
+        :raises ValueError: Si l'étiquette est invalide ou si le contexte est déjà finalisé.
+        """
+        self._check_open()
+        if not hmac.compare_digest(self._tag(), bytes(tag)):
+            raise ValueError("Étiquette d'authentification invalide.")
+
+
+def gcm_encrypt(plaintext, key, iv, aad=b''):
+    """
+    Chiffre et authentifie un message avec AES-GCM.
+
+    :param plaintext: Message en clair.
+    :param key: Clé de 16, 24 ou 32 octets.
+    :param iv: Vecteur d'initialisation.
+    :param aad: Données associées.
+    :return: Le chiffré suivi de l'étiquette de 16 octets.
+    """
+    encryptor = GCMEncryptor(key, iv, aad)
+    return encryptor.update(plaintext) + encryptor.finalize()
+
+
+def gcm_decrypt(ciphertext, key, iv, aad=b''):
+    """
+    Vérifie et déchiffre un message produit par `gcm_encrypt`.
+
+    :param ciphertext: Chiffré suivi de l'étiquette.
+    :param key: Clé de 16, 24 ou 32 octets.
+    :param iv: Vecteur d'initialisation.
+    :param aad: Données associées.
+    :return: Le message en clair.
+    """
+    if len(ciphertext) < TAG_SIZE:
+        raise ValueError("Message trop court.")
+    decryptor = GCMDecryptor(key, iv, aad)
+    plaintext = decryptor.update(ciphertext[:-TAG_SIZE])
+    decryptor.finalize(ciphertext[-TAG_SIZE:])
+    return plaintext
+
+
+if __name__ == "__main__":
+    # Vecteurs de test de la spécification de GCM (McGrew et Viega, cas 2, 4 et 6).
+    sealed = gcm_encrypt(bytes(16), bytes(16), bytes(12))
+    assert sealed.hex() == "0388dace60b6a392f328c2b971b2fe78" "ab6e47d42cec13bdf53a67b21257bddf"
+
+    key = bytes.fromhex("feffe9928665731c6d6a8f9467308308")
+    plaintext = bytes.fromhex("d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72"
+                              "1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b39")
+    aad = bytes.fromhex("feedfacedeadbeeffeedfacedeadbeefabaddad2")
+    sealed = gcm_encrypt(plaintext, key, bytes.fromhex("cafebabefacedbaddecaf888"), aad)
+    assert sealed[:16].hex() == "42831ec2217774244b7221b784d0d49c"
+    assert sealed[-16:].hex() == "5bc94fbc3221a5db94fae95ae7121a47"
+    assert gcm_decrypt(sealed, key, bytes.fromhex("cafebabefacedbaddecaf888"), aad) == plaintext
+
+    iv = bytes.fromhex("9313225df88406e555909c5aff5269aa6a7a9538534f7da1e4c303d2a318a728"
+                       "c3c0c95156809539fcf0e2429a6b525416aedbf5a0de6a57a637b39b")
+    assert gcm_encrypt(plaintext, key, iv, aad)[-16:].hex() == "619cc5aefffe0bfa462af43c1699d050"
+    print("Vecteurs de test GCM vérifiés")
+
+    # Mode flot : morceaux de tailles quelconques, une seule passe sur les données.
+    encryptor = GCMEncryptor(key, bytes.fromhex("cafebabefacedbaddecaf888"), aad)
+    pieces = [encryptor.update(plaintext[i:i + 7]) for i in range(0, len(plaintext), 7)]
+    assert b''.join(pieces) + encryptor.finalize() == sealed
+
+    # Après `finalize`, l'étiquette reste disponible et le contexte refuse toute nouvelle donnée.
+    assert encryptor.tag == sealed[-16:]
+    for call in (lambda: encryptor.update(b"x"), encryptor.finalize):
+        try:
+            call()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Contexte finalisé réutilisé")
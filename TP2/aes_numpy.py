@@ -0,0 +1,144 @@
+import numpy as np
+
+from TP2 import Sbox
+from aes_ttable import AES
+
+BLOCK_SIZE = 16
+# Nombre de blocs traités ensemble, pour borner la mémoire utilisée (16 Mio par lot).
+BATCH_BLOCKS = 1 << 20
+
+SBOX = np.array(Sbox, dtype=np.uint8)
+# Les blocs sont rangés colonne par colonne (octet 4*colonne + ligne). Après ShiftRows, la ligne r
+# de la colonne c contient l'octet de la ligne r de la colonne c + r.
+SHIFT_ROWS = np.array([4 * ((col + row) % 4) + row for col in range(4) for row in range(4)])
+
+
+def _xtime(x):
+    """
+    Multiplication par 2 dans GF(2^8) d'un tableau uint8.
+    """
+    return (x << np.uint8(1)) ^ ((x >> np.uint8(7)) * np.uint8(0x1b))
+
+
+def _mix_columns(state):
+    """
+    MixColumns appliqué à tous les blocs d'un tableau (N, 16), avec xtime :
+    b_r = a_r ^ t ^ 2.(a_r ^ a_(r+1)), où t est le XOR des quatre octets de la colonne.
+    """
+    columns = state.reshape(-1, 4, 4)
+    a0, a1, a2, a3 = columns[:, :, 0], columns[:, :, 1], columns[:, :, 2], columns[:, :, 3]
+    t = a0 ^ a1 ^ a2 ^ a3
+    out = np.empty_like(columns)
+    out[:, :, 0] = a0 ^ t ^ _xtime(a0 ^ a1)
+    out[:, :, 1] = a1 ^ t ^ _xtime(a1 ^ a2)
+    out[:, :, 2] = a2 ^ t ^ _xtime(a2 ^ a3)
+    out[:, :, 3] = a3 ^ t ^ _xtime(a3 ^ a0)
+    return out.reshape(-1, 16)
+
+
+def round_key_array(key):
+    """
+    :param key: Clé de 16, 24 ou 32 octets.
+    :return: Les Nr + 1 clés de round, sous forme de tableau uint8 (Nr + 1, 16), tirées du cache de `AES`.
+    """
+    words = np.array(AES(key).encryption_keys, dtype='>u4')
+    return words.view(np.uint8).reshape(-1, 16)
+
+
+def encrypt_blocks(blocks, round_keys):
+    """
+    Chiffre N blocs à la fois : chaque étape d'un round est une seule opération NumPy sur tout
+    le tableau (indexation dans SBOX pour SubBytes, permutation d'octets pour ShiftRows).
+
+    :param blocks: Tableau uint8 (N, 16), blocs rangés colonne par colonne comme dans FIPS-197.
+    :param round_keys: Clés de round, résultat de `round_key_array`.
+    :return: Tableau uint8 (N, 16) des blocs chiffrés.
+    """
+    state = blocks ^ round_keys[0]
+    for round_key in round_keys[1:-1]:
+        state = _mix_columns(SBOX[state][:, SHIFT_ROWS])
+        state ^= round_key
+    return SBOX[state][:, SHIFT_ROWS] ^ round_keys[-1]
+
+
+def ecb_encrypt(data, key):
+    """
+    Chiffrement en mode ECB d'un message dont la taille est un multiple de 16 octets, par lots de blocs.
+
+    :param data: Message (bytes ou tableau uint8).
+    :param key: Clé de 16, 24 ou 32 octets.
+    :return: Le chiffré sous forme de `bytes`.
+    """
+    blocks = np.frombuffer(bytes(data), dtype=np.uint8)
+    if blocks.size % BLOCK_SIZE:
+        raise ValueError("La taille du message doit être un multiple de 16 octets en mode ECB.")
+    blocks = blocks.reshape(-1, BLOCK_SIZE)
+    round_keys = round_key_array(key)
+    out = np.empty_like(blocks)
+    for start in range(0, len(blocks), BATCH_BLOCKS):
+        out[start:start + BATCH_BLOCKS] = encrypt_blocks(blocks[start:start + BATCH_BLOCKS], round_keys)
+    return out.tobytes()
+
+
+def counter_blocks(initial_counter, first_block, n_blocks):
+    """
+    Blocs compteurs du mode CTR : le bloc initial, lu comme un entier de 128 bits gros-boutiste,
+    augmenté de 0, 1, 2, ... modulo 2^128 (NIST SP 800-38A).
+
+    :param initial_counter: Bloc compteur initial de 16 octets.
+    :param first_block: Numéro du premier bloc.
+    :param n_blocks: Nombre de blocs.
+    :return: Tableau uint8 (n_blocks, 16).
+    """
+    value = (int.from_bytes(initial_counter, 'big') + first_block) % (1 << 128)
+    high = np.uint64(value >> 64)
+    low = np.uint64(value & 0xffffffffffffffff)
+    counters = np.empty((n_blocks, 2), dtype='>u8')
+    counters[:, 1] = low + np.arange(n_blocks, dtype=np.uint64)  # Modulo 2^64
+    counters[:, 0] = high + (counters[:, 1] < low)  # Retenue
+    return counters.view(np.uint8)
+
+
+def ctr_encrypt(data, key, initial_counter, first_block=0):
+    """
+    Chiffrement (ou déchiffrement) en mode CTR : le flot de clés est le chiffré des blocs compteurs,
+    calculé par lots, puis combiné au message avec `np.bitwise_xor`.
+
+    :param data: Message de taille quelconque.
+    :param key: Clé de 16, 24 ou 32 octets.
+    :param initial_counter: Bloc compteur initial de 16 octets.
+    :param first_block: Numéro du bloc correspondant au premier octet de `data`.
+    :return: Le résultat sous forme de `bytes`.
+    """
+    assert len(initial_counter) == BLOCK_SIZE  # Vérification de la taille du compteur
+    data = np.frombuffer(bytes(data), dtype=np.uint8)
+    round_keys = round_key_array(key)
+    out = np.empty_like(data)
+    n_blocks = (data.size + BLOCK_SIZE - 1) // BLOCK_SIZE
+    for start in range(0, n_blocks, BATCH_BLOCKS):
+        count = min(BATCH_BLOCKS, n_blocks - start)
+        begin = start * BLOCK_SIZE
+        end = min(begin + count * BLOCK_SIZE, data.size)
+        key_stream = encrypt_blocks(counter_blocks(initial_counter, first_block + start, count), round_keys)
+        np.bitwise_xor(data[begin:end], key_stream.reshape(-1)[:end - begin], out=out[begin:end])
+    return out.tobytes()
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : vecteurs de NIST SP 800-38A (F.1.1 et F.5.1) puis chiffrement de 16 Mio.
+    import os
+    import time
+
+    key = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+    plaintext = bytes.fromhex("6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51")
+    assert ecb_encrypt(plaintext, key).hex() == "3ad77bb40d7a3660a89ecaf32466ef97f5d3d58503b9699de785895a96fdbaaf"
+    initial_counter = bytes.fromhex("f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff")
+    assert ctr_encrypt(plaintext, key, initial_counter).hex() == \
+        "874d6191b620e3261bef6864990db6ce9806f66b7970fdff8617187bb9fffdff"
+    print("Vecteurs de test SP 800-38A vérifiés")
+
+    data = os.urandom(16 << 20)
+    start = time.perf_counter()
+    encrypted = ctr_encrypt(data, key, initial_counter)
+    print(f"16 Mio chiffrés en mode CTR en {time.perf_counter() - start:.2f} s")
+    assert ctr_encrypt(encrypted, key, initial_counter) == data
@@ -0,0 +1,272 @@
+from functools import lru_cache
+
+from TP2 import InvSbox, Sbox, multiply_poly, rc
+
+# Nombre de clés dont les clés de round sont conservées par `AES`.
+KEY_CACHE_SIZE = 4096
+
+
+def _rotr8(word):
+    """
+    Rotation à droite d'un octet d'un mot de 32 bits.
+    """
+    return ((word >> 8) | (word << 24)) & 0xffffffff
+
+
+# Tables T : pour chaque octet x, la colonne (2.S[x], S[x], S[x], 3.S[x]) produite par SubBytes
+# puis MixColumns, en mot de 32 bits (octet de la ligne 0 en poids fort). T1, T2 et T3 sont les
+# rotations de T0, pour les octets venant des lignes 1, 2 et 3 après ShiftRows.
+T0 = tuple((multiply_poly(s, 2) << 24) | (s << 16) | (s << 8) | multiply_poly(s, 3) for s in Sbox)
+T1 = tuple(_rotr8(t) for t in T0)
+T2 = tuple(_rotr8(t) for t in T1)
+T3 = tuple(_rotr8(t) for t in T2)
+
+# Tables T inverses : colonne (14.S'[x], 9.S'[x], 13.S'[x], 11.S'[x]) produite par InvSubBytes
+# puis InvMixColumns, S' étant la S-Box inverse.
+TD0 = tuple((multiply_poly(s, 0x0e) << 24) | (multiply_poly(s, 0x09) << 16) | (multiply_poly(s, 0x0d) << 8)
+            | multiply_poly(s, 0x0b) for s in InvSbox)
+TD1 = tuple(_rotr8(t) for t in TD0)
+TD2 = tuple(_rotr8(t) for t in TD1)
+TD3 = tuple(_rotr8(t) for t in TD2)
+
+
+def _sub_word(word):
+    """
+    Applique la S-Box à chacun des quatre octets d'un mot.
+    """
+    return Sbox[word >> 24] << 24 | Sbox[(word >> 16) & 0xff] << 16 | Sbox[(word >> 8) & 0xff] << 8 | Sbox[word & 0xff]
+
+
+def expand_key(key):
+    """
+    Calcule les clés de round sous forme de mots de 32 bits (un par colonne), comme `key_expansion`
+    mais pour des clés de 128, 192 ou 256 bits (FIPS-197, 5.2).
+
+    :param key: Clé de 16, 24 ou 32 octets (bytes ou liste d'entiers).
+    :return: Tuple de 4 * (Nr + 1) mots, avec Nr = 10, 12 ou 14 rounds.
+    """
+    if len(key) not in (16, 24, 32):
+        raise ValueError("La clé doit faire 16, 24 ou 32 octets.")
+    nk = len(key) // 4
+    n_words = 4 * (nk + 7)
+    words = [int.from_bytes(bytes(key[i:i + 4]), 'big') for i in range(0, len(key), 4)]
+    for i in range(nk, n_words):
+        temp = words[-1]
+        if i % nk == 0:
+            temp = _sub_word(((temp << 8) | (temp >> 24)) & 0xffffffff) ^ (rc[i // nk - 1] << 24)
+        elif nk > 6 and i % nk == 4:
+            temp = _sub_word(temp)
+        words.append(words[i - nk] ^ temp)
+    return tuple(words)
+
+
+def _inv_mix_word(word):
+    """
+    InvMixColumns appliqué à une colonne représentée par un mot de 32 bits.
+    """
+    a = word.to_bytes(4, 'big')
+    m = multiply_poly
+    return int.from_bytes(bytes(
+        m(a[r], 0x0e) ^ m(a[(r + 1) % 4], 0x0b) ^ m(a[(r + 2) % 4], 0x0d) ^ m(a[(r + 3) % 4], 0x09)
+        for r in range(4)), 'big')
+
+
+def decryption_keys(round_keys):
+    """
+    Clés de round du déchiffrement par le chiffrement inverse équivalent (FIPS-197, 5.3.5) :
+    les clés sont prises dans l'ordre inverse et InvMixColumns est appliqué à celles des rounds internes.
+
+    :param round_keys: Clés de round, résultat de `expand_key`.
+    :return: Tuple de mots, de même longueur.
+    """
+    n_rounds = len(round_keys) // 4 - 1
+    keys = []
+    for r in range(n_rounds, -1, -1):
+        words = round_keys[4 * r:4 * r + 4]
+        keys.extend(words if r in (0, n_rounds) else (_inv_mix_word(w) for w in words))
+    return tuple(keys)
+
+
+def encrypt_block(block, round_keys):
+    """
+    Chiffre un bloc de 16 octets. L'état est formé de quatre mots de 32 bits (les colonnes), et chaque
+    round complet se réduit à 16 accès aux tables T et à des XOR : SubBytes, ShiftRows et MixColumns
+    sont combinés dans les tables.
+
+    :param block: Bloc de 16 octets (octets rangés colonne par colonne, comme dans FIPS-197).
+    :param round_keys: Clés de round, résultat de `expand_key`.
+    :return: Le bloc chiffré de 16 octets.
+    """
+    k = round_keys
+    s0 = int.from_bytes(block[0:4], 'big') ^ k[0]
+    s1 = int.from_bytes(block[4:8], 'big') ^ k[1]
+    s2 = int.from_bytes(block[8:12], 'big') ^ k[2]
+    s3 = int.from_bytes(block[12:16], 'big') ^ k[3]
+    for i in range(4, len(k) - 4, 4):
+        s0, s1, s2, s3 = (
+            T0[s0 >> 24] ^ T1[(s1 >> 16) & 0xff] ^ T2[(s2 >> 8) & 0xff] ^ T3[s3 & 0xff] ^ k[i],
+            T0[s1 >> 24] ^ T1[(s2 >> 16) & 0xff] ^ T2[(s3 >> 8) & 0xff] ^ T3[s0 & 0xff] ^ k[i + 1],
+            T0[s2 >> 24] ^ T1[(s3 >> 16) & 0xff] ^ T2[(s0 >> 8) & 0xff] ^ T3[s1 & 0xff] ^ k[i + 2],
+            T0[s3 >> 24] ^ T1[(s0 >> 16) & 0xff] ^ T2[(s1 >> 8) & 0xff] ^ T3[s2 & 0xff] ^ k[i + 3],
+        )
+    # Dernier round : SubBytes et ShiftRows seulement.
+    S = Sbox
+    i = len(k) - 4
+    t0 = (S[s0 >> 24] << 24 | S[(s1 >> 16) & 0xff] << 16 | S[(s2 >> 8) & 0xff] << 8 | S[s3 & 0xff]) ^ k[i]
+    t1 = (S[s1 >> 24] << 24 | S[(s2 >> 16) & 0xff] << 16 | S[(s3 >> 8) & 0xff] << 8 | S[s0 & 0xff]) ^ k[i + 1]
+    t2 = (S[s2 >> 24] << 24 | S[(s3 >> 16) & 0xff] << 16 | S[(s0 >> 8) & 0xff] << 8 | S[s1 & 0xff]) ^ k[i + 2]
+    t3 = (S[s3 >> 24] << 24 | S[(s0 >> 16) & 0xff] << 16 | S[(s1 >> 8) & 0xff] << 8 | S[s2 & 0xff]) ^ k[i + 3]
+    return ((t0 << 96) | (t1 << 64) | (t2 << 32) | t3).to_bytes(16, 'big')
+
+
+def decrypt_block(block, round_keys):
+    """
+    Déchiffre un bloc de 16 octets par le chiffrement inverse équivalent (FIPS-197, 5.3.5) : les rounds
+    ont la même structure que le chiffrement, avec les tables T inverses (InvSubBytes, InvShiftRows
+    et InvMixColumns combinés) et des clés de round transformées par InvMixColumns.
+
+    :param block: Bloc chiffré de 16 octets.
+    :param round_keys: Clés de round du déchiffrement, résultat de `decryption_keys`.
+    :return: Le bloc déchiffré de 16 octets.
+    """
+    k = round_keys
+    s0 = int.from_bytes(block[0:4], 'big') ^ k[0]
+    s1 = int.from_bytes(block[4:8], 'big') ^ k[1]
+    s2 = int.from_bytes(block[8:12], 'big') ^ k[2]
+    s3 = int.from_bytes(block[12:16], 'big') ^ k[3]
+    for i in range(4, len(k) - 4, 4):
+        s0, s1, s2, s3 = (
+            TD0[s0 >> 24] ^ TD1[(s3 >> 16) & 0xff] ^ TD2[(s2 >> 8) & 0xff] ^ TD3[s1 & 0xff] ^ k[i],
+            TD0[s1 >> 24] ^ TD1[(s0 >> 16) & 0xff] ^ TD2[(s3 >> 8) & 0xff] ^ TD3[s2 & 0xff] ^ k[i + 1],
+            TD0[s2 >> 24] ^ TD1[(s1 >> 16) & 0xff] ^ TD2[(s0 >> 8) & 0xff] ^ TD3[s3 & 0xff] ^ k[i + 2],
+            TD0[s3 >> 24] ^ TD1[(s2 >> 16) & 0xff] ^ TD2[(s1 >> 8) & 0xff] ^ TD3[s0 & 0xff] ^ k[i + 3],
+        )
+    # Dernier round : InvSubBytes et InvShiftRows seulement.
+    S = InvSbox
+    i = len(k) - 4
+    t0 = (S[s0 >> 24] << 24 | S[(s3 >> 16) & 0xff] << 16 | S[(s2 >> 8) & 0xff] << 8 | S[s1 & 0xff]) ^ k[i]
+    t1 = (S[s1 >> 24] << 24 | S[(s0 >> 16) & 0xff] << 16 | S[(s3 >> 8) & 0xff] << 8 | S[s2 & 0xff]) ^ k[i + 1]
+    t2 = (S[s2 >> 24] << 24 | S[(s1 >> 16) & 0xff] << 16 | S[(s0 >> 8) & 0xff] << 8 | S[s3 & 0xff]) ^ k[i + 2]
+    t3 = (S[s3 >> 24] << 24 | S[(s2 >> 16) & 0xff] << 16 | S[(s1 >> 8) & 0xff] << 8 | S[s0 & 0xff]) ^ k[i + 3]
+    return ((t0 << 96) | (t1 << 64) | (t2 << 32) | t3).to_bytes(16, 'big')
+
+
+def state_to_bytes(state):
+    """
+    :param state: État 4x4 de `TP2` (state[ligne][colonne]).
+    :return: Les 16 octets de l'état, colonne par colonne.
+    """
+    return bytes(state[row][col] for col in range(4) for row in range(4))
+
+
+def bytes_to_state(block):
+    """
+    :param block: Bloc de 16 octets.
+    :return: L'état 4x4 correspondant (state[ligne][colonne]).
+    """
+    return [[block[4 * col + row] for col in range(4)] for row in range(4)]
+
+
+def encrypt_state(state, round_keys):
+    """
+    Équivalent de `complete_encryption`, sur un état 4x4.
+
+    :param state: État 4x4 (state[ligne][colonne]).
+    :param round_keys: Clés de round, résultat de `expand_key`.
+    :return: L'état chiffré.
+    """
+    return bytes_to_state(encrypt_block(state_to_bytes(state), round_keys))
+
+
+def decrypt_state(state, round_keys):
+    """
+    Équivalent de `complete_decryption`, sur un état 4x4.
+
+    :param state: État 4x4 chiffré (state[ligne][colonne]).
+    :param round_keys: Clés de round du déchiffrement, résultat de `decryption_keys`.
+    :return: L'état déchiffré.
+    """
+    return bytes_to_state(decrypt_block(state_to_bytes(state), round_keys))
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _key_schedules(key):
+    """
+    :param key: Clé sous forme de `bytes`.
+    :return: Les clés de round du chiffrement et du déchiffrement, calculées une fois par clé.
+    """
+    round_keys = expand_key(key)
+    return round_keys, decryption_keys(round_keys)
+
+
+class AES:
+    """
+    Chiffrement AES-128, AES-192 ou AES-256 avec une clé donnée. Les clés de round (chiffrement et
+    déchiffrement) sont des tuples de mots de 32 bits ; elles sont conservées dans un cache LRU indexé
+    par la clé, si bien que recréer un objet pour une clé récemment utilisée ne refait pas l'expansion.
+    """
+
+    __slots__ = ("rounds", "encryption_keys", "decryption_keys")
+
+    def __init__(self, key):
+        """
+        :param key: Clé de 16, 24 ou 32 octets.
+        """
+        self.encryption_keys, self.decryption_keys = _key_schedules(bytes(key))
+        self.rounds = len(self.encryption_keys) // 4 - 1
+
+    def encrypt_block(self, block):
+        """
+        :param block: Bloc de 16 octets.
+        :return: Le bloc chiffré.
+        """
+        return encrypt_block(block, self.encryption_keys)
+
+    def decrypt_block(self, block):
+        """
+        :param block: Bloc chiffré de 16 octets.
+        :return: Le bloc déchiffré.
+        """
+        return decrypt_block(block, self.decryption_keys)
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : exemple de FIPS-197 et comparaison avec `complete_encryption`.
+    import time
+    from TP2 import complete_decryption, complete_encryption, key, state
+
+    round_keys = expand_key(key)
+    assert encrypt_state(state, round_keys) == [[int(x) for x in row] for row in complete_encryption(state)]
+    encrypted = complete_encryption(state)
+    assert decrypt_state(encrypted, decryption_keys(round_keys)) == complete_decryption(encrypted) == state
+    print("Bloc chiffré:", encrypt_block(state_to_bytes(state), round_keys).hex())
+
+    start = time.perf_counter()
+    complete_encryption(state)
+    reference_time = time.perf_counter() - start
+    n_blocks = 10000
+    block = state_to_bytes(state)
+    start = time.perf_counter()
+    for _ in range(n_blocks):
+        encrypt_block(block, round_keys)
+    ttable_time = (time.perf_counter() - start) / n_blocks
+    print(f"Par bloc : complete_encryption {reference_time * 1e6:.0f} µs, tables T {ttable_time * 1e6:.1f} µs")
+
+    start = time.perf_counter()
+    complete_decryption(encrypted)
+    reference_time = time.perf_counter() - start
+    inverse_keys = decryption_keys(round_keys)
+    start = time.perf_counter()
+    for _ in range(n_blocks):
+        decrypt_block(block, inverse_keys)
+    ttable_time = (time.perf_counter() - start) / n_blocks
+    print(f"Par bloc : complete_decryption {reference_time * 1e6:.0f} µs, tables T inverses {ttable_time * 1e6:.1f} µs")
+
+    # Vecteurs de FIPS-197 (annexe C) pour les trois tailles de clé.
+    block = bytes.fromhex("00112233445566778899aabbccddeeff")
+    for size, expected in ((16, "69c4e0d86a7b0430d8cdb78070b4c55a"), (24, "dda97ca4864cdfe06eaf70a0ec0d7191"),
+                           (32, "8ea2b7ca516745bfeafc49904b496089")):
+        cipher = AES(bytes(range(size)))
+        assert cipher.encrypt_block(block).hex() == expected
+        assert cipher.decrypt_block(bytes.fromhex(expected)) == block
+        print(f"AES-{8 * size} ({cipher.rounds} rounds) :", expected)
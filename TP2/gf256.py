@@ -0,0 +1,113 @@
+import numpy as np
+
+# Polynôme irréductible d'AES : x^8 + x^4 + x^3 + x + 1.
+IRREDUCIBLE_POLY = 0x11b
+GENERATOR = 0x03
+
+
+def _build_log_tables():
+    """
+    Construit les tables d'exponentielle et de logarithme en base 0x03 : les puissances successives
+    du générateur parcourent les 255 éléments non nuls de GF(2^8).
+
+    :return: Le couple (EXP, LOG). EXP a 510 entrées pour éviter la réduction modulo 255 de LOG[a] + LOG[b].
+    """
+    exp = np.zeros(510, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int16)
+    x = 1
+    for i in range(255):
+        exp[i] = exp[i + 255] = x
+        log[x] = i
+        # Multiplication par 3 : x ^ xtime(x).
+        x ^= (x << 1) ^ (IRREDUCIBLE_POLY if x & 0x80 else 0)
+    return exp, log
+
+
+EXP, LOG = _build_log_tables()
+
+
+def gf_mul(a, b):
+    """
+    Multiplication dans GF(2^8), élément par élément, de deux tableaux (ou entiers) d'octets :
+    a.b = EXP[LOG[a] + LOG[b]], et 0 si l'un des facteurs est nul.
+
+    :param a: Tableau d'octets.
+    :param b: Tableau d'octets (diffusé avec `a`).
+    :return: Tableau uint8 des produits.
+    """
+    a = np.asarray(a, dtype=np.uint8)
+    b = np.asarray(b, dtype=np.uint8)
+    return np.where((a == 0) | (b == 0), np.uint8(0), EXP[LOG[a] + LOG[b]])
+
+
+def gf_inverse(a):
+    """
+    Inverse dans GF(2^8) : a^-1 = EXP[255 - LOG[a]], avec la convention 0^-1 = 0 d'AES.
+
+    :param a: Tableau d'octets.
+    :return: Tableau uint8 des inverses.
+    """
+    a = np.asarray(a, dtype=np.uint8)
+    return np.where(a == 0, np.uint8(0), EXP[255 - LOG[a]])
+
+
+def _rotl8(x, n):
+    """
+    Rotation à gauche de n bits d'un tableau d'octets.
+    """
+    return (x << np.uint8(n)) | (x >> np.uint8(8 - n))
+
+
+def affine(x):
+    """
+    Transformation affine de la S-Box d'AES, sur tout un tableau : b ^ (b <<< 1) ^ (b <<< 2) ^ (b <<< 3)
+    ^ (b <<< 4) ^ 0x63, ce qui revient au produit par la matrice de `apply_affine_transformation`.
+
+    :param x: Tableau d'octets.
+    :return: Tableau uint8 transformé.
+    """
+    x = np.asarray(x, dtype=np.uint8)
+    return x ^ _rotl8(x, 1) ^ _rotl8(x, 2) ^ _rotl8(x, 3) ^ _rotl8(x, 4) ^ np.uint8(0x63)
+
+
+# Tables complètes, calculées en une passe sur les 256 octets.
+BYTES = np.arange(256, dtype=np.uint8)
+SBOX = affine(gf_inverse(BYTES))
+INV_SBOX = np.empty(256, dtype=np.uint8)
+INV_SBOX[SBOX] = BYTES
+XTIME = gf_mul(BYTES, 2)
+# Table de multiplication complète : MUL[a, b] = a.b (64 Kio).
+MUL = gf_mul(BYTES[:, None], BYTES[None, :])
+
+
+def matrix_multiply(matrix, state):
+    """
+    Produit, dans GF(2^8), d'une matrice de coefficients par l'état : result[i][j] est le XOR des
+    MUL[matrix[i][k], state[k][j]]. Avec la matrice de MixColumns (ou de InvMixColumns), chaque colonne
+    de l'état est transformée, pour toutes les colonnes en même temps.
+
+    :param matrix: Matrice 4x4 de coefficients.
+    :param state: État 4xN (state[ligne][colonne]).
+    :return: Tableau uint8 4xN.
+    """
+    matrix = np.asarray(matrix, dtype=np.uint8)
+    state = np.asarray(state, dtype=np.uint8)
+    return np.bitwise_xor.reduce(MUL[matrix[:, :, None], state[None, :, :]], axis=1)
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : comparaison avec les fonctions de la partie 3 de TP2.
+    import time
+    from TP2 import InvSbox, Sbox, apply_affine_transformation, inverse_in_gf2_8, multiply_poly
+
+    assert tuple(SBOX.tolist()) == Sbox
+    assert tuple(INV_SBOX.tolist()) == InvSbox
+    assert all(int(MUL[a, b]) == multiply_poly(a, b) for a in range(256) for b in range(0, 256, 7))
+
+    start = time.perf_counter()
+    reference = [apply_affine_transformation(inverse_in_gf2_8(x)) for x in range(256)]
+    reference_time = time.perf_counter() - start
+    start = time.perf_counter()
+    table = affine(gf_inverse(BYTES))
+    print(f"S-Box complète : partie 3 {reference_time:.3f} s, tables log/exp {time.perf_counter() - start:.6f} s")
+    assert table.tolist() == reference
@@ -0,0 +1,392 @@
+import struct
+from operator import xor
+
+MASK64 = (1 << 64) - 1
+
+# Constantes de round de iota (calculées une fois pour toutes).
+ROUND_CONSTANTS = (
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+)
+
+
+def _rho_pi_table():
+    """
+    Étapes rho et pi combinées : pour chaque ligne d'indice x + 5y, la rotation de rho et la position
+    (y, 2x + 3y) où pi la déplace. Les décalages de rho sont (t + 1)(t + 2) / 2 le long de la
+    trajectoire (x, y) -> (y, 2x + 3y) partant de (1, 0) (FIPS 202, 3.2.2).
+
+    :return: Tuple de 25 triplets (source, destination, rotation).
+    """
+    rotations = [0] * 25
+    x, y = 1, 0
+    for t in range(24):
+        rotations[x + 5 * y] = ((t + 1) * (t + 2) // 2) % 64
+        x, y = y, (2 * x + 3 * y) % 5
+    return tuple((x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5), rotations[x + 5 * y])
+                 for y in range(5) for x in range(5))
+
+
+RHO_PI = _rho_pi_table()
+
+
+def _rotl_source(name, n):
+    """
+    Code source de la rotation à gauche de n bits d'une ligne de 64 bits.
+    """
+    if n == 0:
+        return name
+    return f"((({name} << {n}) | ({name} >> {64 - n})) & {MASK64:#x})"
+
+
+def permutation_source():
+    """
+    Génère le code source de `keccak_f1600` : les 25 lignes sont des variables locales (a0 à a24),
+    et le corps d'un round est écrit en ligne, sans liste ni appel de fonction, à partir des tables
+    `RHO_PI` et `ROUND_CONSTANTS`.
+
+    :return: Le code source de la fonction `keccak_f1600(state)`.
+    """
+    lanes = ", ".join(f"a{i}" for i in range(25))
+    body = [f"{lanes} = state", "for rc in ROUND_CONSTANTS:"]
+    # theta : parités des colonnes, puis D[x] = C[x - 1] ^ (C[x + 1] <<< 1).
+    for x in range(5):
+        body.append(f"    c{x} = a{x} ^ a{x + 5} ^ a{x + 10} ^ a{x + 15} ^ a{x + 20}")
+    for x in range(5):
+        body.append(f"    d{x} = c{(x - 1) % 5} ^ {_rotl_source(f'c{(x + 1) % 5}', 1)}")
+    # theta appliqué à la volée, puis rho et pi combinés : b[destination] = (a[source] ^ D) <<< r.
+    for source, destination, rotation in RHO_PI:
+        body.append(f"    b{destination} = {_rotl_source(f'(a{source} ^ d{source % 5})', rotation)}")
+    # chi, puis iota sur la première ligne.
+    for y in range(5):
+        for x in range(5):
+            i = x + 5 * y
+            body.append(f"    a{i} = b{i} ^ (~b{(x + 1) % 5 + 5 * y} & b{(x + 2) % 5 + 5 * y})")
+    body.append("    a0 ^= rc")
+    body.append(f"state[:] = ({lanes})")
+    body.append("return state")
+    return ("def keccak_f1600(state):\n"
+            "    # Code généré par `permutation_source`.\n"
+            + "".join(f"    {line}\n" for line in body))
+
+
+_namespace = {"ROUND_CONSTANTS": ROUND_CONSTANTS}
+exec(compile(permutation_source(), "<keccak_f1600>", "exec"), _namespace)
+keccak_f1600 = _namespace["keccak_f1600"]
+keccak_f1600.__doc__ = """
+    Applique en place les 24 rounds de Keccak-f[1600] à un état de 25 lignes de 64 bits
+    (indice x + 5y). Aucune liste n'est créée pendant les rounds.
+
+    :param state: Liste de 25 entiers, modifiée en place.
+    :return: La même liste.
+    """
+
+
+class KeccakSponge:
+    """
+    Construction éponge incrémentale sur `keccak_f1600`. Les blocs complets sont absorbés directement
+    depuis les données reçues : chaque bloc est lu en lignes de 64 bits par `struct.unpack_from` sur
+    une `memoryview`, sans copie. Seul un reste de moins d'un bloc est conservé entre deux appels
+    à `update`, si bien que la mémoire utilisée ne dépend pas de la taille du message.
+    """
+
+    __slots__ = ("rate", "suffix", "state", "_lanes", "_buffer")
+
+    def __init__(self, rate_bytes, suffix, data=b''):
+        """
+        :param rate_bytes: Taille du bloc absorbé, en octets (144 pour SHA3-224, 136 pour SHA3-256, ...).
+        :param suffix: Bits de séparation de domaine et premier bit du padding (0x06 pour SHA-3, 0x1f pour SHAKE).
+        :param data: Premières données à absorber.
+        """
+        self.rate = rate_bytes
+        self.suffix = suffix
+        self.state = [0] * 25
+        self._lanes = struct.Struct(f'<{rate_bytes // 8}Q')
+        self._buffer = bytearray()
+        if data:
+            self.update(data)
+
+    def _absorb(self, view, end):
+        """
+        Absorbe les blocs complets de `view[0:end]` (`end` multiple de la taille du bloc).
+        """
+        state = self.state
+        rate = self.rate
+        n_lanes = rate // 8
+        unpack_from = self._lanes.unpack_from
+        for offset in range(0, end, rate):
+            state[:n_lanes] = map(xor, state, unpack_from(view, offset))
+            keccak_f1600(state)
+
+    def update(self, data):
+        """
+        Ajoute des données au message.
+
+        :param data: Octets (bytes, bytearray, memoryview, ...).
+        """
+        view = memoryview(data).cast('B')
+        buffer = self._buffer
+        rate = self.rate
+        if buffer:
+            taken = min(rate - len(buffer), len(view))
+            buffer += view[:taken]
+            view = view[taken:]
+            if len(buffer) < rate:
+                return
+            self._absorb(buffer, rate)
+            buffer.clear()
+        full = len(view) - len(view) % rate
+        self._absorb(view, full)
+        buffer += view[full:]
+
+    def copy(self):
+        """
+        :return: Une copie indépendante de l'état courant (pour hacher plusieurs messages de même préfixe).
+        """
+        other = object.__new__(type(self))
+        for name in KeccakSponge.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.state = self.state[:]
+        other._buffer = self._buffer[:]
+        return other
+
+    def _final_state(self):
+        """
+        :return: L'état après absorption du reste et du padding, sans modifier l'objet.
+        """
+        block = self._buffer + bytes([self.suffix]) + bytes(self.rate - len(self._buffer) - 1)
+        block[-1] |= 0x80
+        state = self.state[:]
+        state[:self.rate // 8] = map(xor, state, self._lanes.unpack(block))
+        keccak_f1600(state)
+        return state
+
+    def _squeeze(self, state, n_bytes):
+        """
+        Extrait `n_bytes` octets d'un état final (phase d'essorage), en appliquant la permutation
+        entre deux blocs.
+
+        :param state: État final, modifié en place.
+        :param n_bytes: Nombre d'octets.
+        :return: Les octets extraits.
+        """
+        out = bytearray()
+        pack = self._lanes.pack
+        while True:
+            out += pack(*state[:self.rate // 8])
+            if len(out) >= n_bytes:
+                return bytes(out[:n_bytes])
+            keccak_f1600(state)
+
+
+class SHA3(KeccakSponge):
+    """
+    Fonction de hachage SHA-3 avec la même interface que les objets de `hashlib`
+    (`update`, `copy`, `digest`, `hexdigest`).
+    """
+
+    __slots__ = ("digest_size",)
+
+    def __init__(self, digest_size, data=b''):
+        """
+        :param digest_size: Taille du condensat en octets (28, 32, 48 ou 64).
+        :param data: Premières données à hacher.
+        """
+        if digest_size not in (28, 32, 48, 64):
+            raise ValueError("SHA-3 est défini pour des condensats de 224, 256, 384 ou 512 bits.")
+        self.digest_size = digest_size
+        super().__init__(200 - 2 * digest_size, 0x06, data)
+
+    @property
+    def name(self):
+        return f"sha3_{8 * self.digest_size}"
+
+    @property
+    def block_size(self):
+        return self.rate
+
+    def copy(self):
+        other = super().copy()
+        other.digest_size = self.digest_size
+        return other
+
+    def digest(self):
+        """
+        :return: Le condensat des données ajoutées jusqu'ici (l'objet peut continuer à être mis à jour).
+        """
+        return self._squeeze(self._final_state(), self.digest_size)
+
+    def hexdigest(self):
+        """
+        :return: Le condensat en hexadécimal.
+        """
+        return self.digest().hex()
+
+
+def sha3_224(data=b''):
+    return SHA3(28, data)
+
+
+def sha3_256(data=b''):
+    return SHA3(32, data)
+
+
+def sha3_384(data=b''):
+    return SHA3(48, data)
+
+
+def sha3_512(data=b''):
+    return SHA3(64, data)
+
+
+class SHAKE(KeccakSponge):
+    """
+    Fonction à sortie extensible SHAKE128 ou SHAKE256 (FIPS 202). Après `update`, `read(n)` renvoie
+    les n octets suivants de la sortie : les blocs sont extraits ligne par ligne avec `struct.pack`,
+    et la permutation n'est appliquée que lorsqu'un nouveau bloc est nécessaire.
+    """
+
+    __slots__ = ("security", "_output", "_offset")
+
+    def __init__(self, security, data=b''):
+        """
+        :param security: Niveau de sécurité en bits (128 ou 256).
+        :param data: Premières données à absorber.
+        """
+        if security not in (128, 256):
+            raise ValueError("SHAKE est défini pour 128 ou 256 bits de sécurité.")
+        self.security = security
+        self._output = None  # Bloc de sortie courant, une fois l'absorption terminée.
+        self._offset = 0
+        super().__init__(200 - security // 4, 0x1f, data)
+
+    @property
+    def name(self):
+        return f"shake_{self.security}"
+
+    @property
+    def block_size(self):
+        return self.rate
+
+    def update(self, data):
+        if self._output is not None:
+            raise ValueError("Impossible d'ajouter des données après le début de la lecture.")
+        super().update(data)
+
+    def copy(self):
+        other = super().copy()
+        other.security = self.security
+        other._output = self._output
+        other._offset = self._offset
+        return other
+
+    def read(self, n_bytes):
+        """
+        Lit la suite de la sortie. Des appels successifs renvoient des morceaux consécutifs d'une
+        même sortie : read(10) + read(20) est égal aux 30 premiers octets.
+
+        :param n_bytes: Nombre d'octets.
+        :return: Les octets lus.
+        """
+        if self._output is None:
+            self.state = self._final_state()
+            self._output = self._lanes.pack(*self.state[:self.rate // 8])
+            self._buffer.clear()
+        out = bytearray()
+        while len(out) < n_bytes:
+            if self._offset == self.rate:
+                keccak_f1600(self.state)
+                self._output = self._lanes.pack(*self.state[:self.rate // 8])
+                self._offset = 0
+            end = min(self.rate, self._offset + n_bytes - len(out))
+            out += self._output[self._offset:end]
+            self._offset = end
+        return bytes(out)
+
+    def digest(self, length):
+        """
+        :param length: Nombre d'octets.
+        :return: Les `length` premiers octets de la sortie, comme `hashlib.shake_*().digest(length)`.
+        """
+        if self._output is not None:
+            raise ValueError("`digest` doit être appelé avant `read`.")
+        return self.copy().read(length)
+
+    def hexdigest(self, length):
+        """
+        :param length: Nombre d'octets.
+        :return: Les `length` premiers octets de la sortie, en hexadécimal.
+        """
+        return self.digest(length).hex()
+
+
+def shake_128(data=b''):
+    return SHAKE(128, data)
+
+
+def shake_256(data=b''):
+    return SHAKE(256, data)
+
+
+def keccak(message, rate_bytes, output_bytes, suffix=0x06):
+    """
+    Construction éponge complète sur un message entier.
+
+    :param message: Message sous forme d'octets.
+    :param rate_bytes: Taille du bloc absorbé, en octets.
+    :param output_bytes: Taille de la sortie, en octets.
+    :param suffix: Bits de séparation de domaine et premier bit du padding.
+    :return: La sortie sous forme de `bytes`.
+    """
+    sponge = KeccakSponge(rate_bytes, suffix, message)
+    return sponge._squeeze(sponge._final_state(), output_bytes)
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : comparaison avec hashlib et avec la permutation de sha.py.
+    import hashlib
+    import os
+    import time
+    import sha
+
+    for length in (0, 1, 71, 72, 135, 136, 137, 1000):
+        message = os.urandom(length)
+        assert keccak(message, 144, 28) == hashlib.sha3_224(message).digest()
+        assert keccak(message, 136, 32) == hashlib.sha3_256(message).digest()
+        assert keccak(message, 104, 48) == hashlib.sha3_384(message).digest()
+        assert keccak(message, 72, 64) == hashlib.sha3_512(message).digest()
+    print("SHA3-224/256/384/512 identiques à hashlib")
+
+    # Hachage incrémental, par morceaux de tailles quelconques.
+    message = os.urandom(5000)
+    h = sha3_256()
+    for start, end in ((0, 1), (1, 137), (137, 300), (300, 5000)):
+        h.update(memoryview(message)[start:end])
+    prefix = h.copy()
+    h.update(b"suite")
+    assert prefix.hexdigest() == hashlib.sha3_256(message).hexdigest()
+    assert h.digest() == hashlib.sha3_256(message + b"suite").digest()
+
+    # Sortie de longueur quelconque, par exemple comme fonction de génération de masque (MGF) :
+    # une seule absorption, puis une permutation par bloc de 168 octets lu.
+    xof = shake_128(b"graine")
+    mask = xof.read(100) + xof.read(400)
+    assert mask == hashlib.shake_128(b"graine").digest(500)
+    assert shake_256(message).hexdigest(64) == hashlib.shake_256(message).hexdigest(64)
+    print("SHAKE128/256 identiques à hashlib")
+
+    state = [int.from_bytes(os.urandom(8), 'little') for _ in range(25)]
+    n = 200
+    start = time.perf_counter()
+    for _ in range(n):
+        sha.keccak_f1600(state)
+    reference_time = (time.perf_counter() - start) / n
+    start = time.perf_counter()
+    for _ in range(n):
+        keccak_f1600(state)
+    print(f"Par permutation : sha.keccak_f1600 {reference_time * 1e6:.0f} µs, "
+          f"keccak_f1600 {(time.perf_counter() - start) / n * 1e6:.0f} µs")
@@ -0,0 +1,141 @@
+import numpy as np
+
+from keccak import RHO_PI, ROUND_CONSTANTS
+
+# Nombre maximal de messages hachés ensemble, pour borner la mémoire utilisée.
+BATCH_MESSAGES = 1 << 16
+
+RC = np.array(ROUND_CONSTANTS, dtype=np.uint64)
+# Rho et pi combinés : la ligne SOURCES[i] tourne de ROTATIONS[i] bits et va en DESTINATIONS[i].
+SOURCES = np.array([source for source, _, _ in RHO_PI])
+DESTINATIONS = np.array([destination for _, destination, _ in RHO_PI])
+ROTATIONS = np.array([rotation for _, _, rotation in RHO_PI], dtype=np.uint64)[:, None]
+# Pour une rotation nulle, (a << 0) | (a >> 0) vaut bien a : on évite ainsi un décalage de 64 bits.
+COUNTER_ROTATIONS = (np.uint64(64) - ROTATIONS) % np.uint64(64)
+
+
+def _permute(a):
+    """
+    Keccak-f[1600] sur un tableau uint64 (25, N) : chaque ligne de l'état est un vecteur des N états,
+    et chaque étape est une opération NumPy sur tous les états à la fois. Le tableau est modifié en place.
+    """
+    one = np.uint64(1)
+    sixty_three = np.uint64(63)
+    lanes = a.reshape(5, 5, -1)  # lanes[y, x]
+    for rc in RC:
+        # theta
+        c = lanes[0] ^ lanes[1] ^ lanes[2] ^ lanes[3] ^ lanes[4]
+        c_next = np.roll(c, -1, axis=0)
+        lanes ^= (np.roll(c, 1, axis=0) ^ ((c_next << one) | (c_next >> sixty_three)))[None]
+        # rho et pi
+        b = np.empty_like(a)
+        moved = a[SOURCES]
+        b[DESTINATIONS] = (moved << ROTATIONS) | (moved >> COUNTER_ROTATIONS)
+        # chi, puis iota
+        rows = b.reshape(5, 5, -1)
+        lanes[...] = rows ^ (~np.roll(rows, -1, axis=1) & np.roll(rows, -2, axis=1))
+        a[0] ^= rc
+
+
+def keccak_f1600_batch(states):
+    """
+    Applique Keccak-f[1600] à N états.
+
+    :param states: Tableau uint64 (N, 25), lignes d'indice x + 5y.
+    :return: Nouveau tableau uint64 (N, 25).
+    """
+    a = np.ascontiguousarray(np.asarray(states, dtype=np.uint64).T)
+    _permute(a)
+    return np.ascontiguousarray(a.T)
+
+
+def _hash_bucket(messages, n_blocks, rate_bytes, output_bytes, suffix):
+    """
+    Hache ensemble des messages dont la version paddée fait `n_blocks` blocs.
+
+    :return: Tableau uint8 (len(messages), output_bytes).
+    """
+    n = len(messages)
+    lengths = np.array([len(m) for m in messages], dtype=np.int64)
+    # Copie de tous les messages dans un tableau (n, n_blocks * rate_bytes), sans boucle par octet.
+    padded = np.zeros((n, n_blocks * rate_bytes), dtype=np.uint8)
+    data = np.frombuffer(b''.join(messages), dtype=np.uint8)
+    rows = np.repeat(np.arange(n), lengths)
+    starts = np.cumsum(lengths) - lengths
+    padded[rows, np.arange(data.size) - np.repeat(starts, lengths)] = data
+    padded[np.arange(n), lengths] ^= np.uint8(suffix)
+    padded[:, -1] |= np.uint8(0x80)
+
+    n_lanes = rate_bytes // 8
+    blocks = padded.view('<u8').astype(np.uint64).T  # (n_blocks * n_lanes, n)
+    state = np.zeros((25, n), dtype=np.uint64)
+    for j in range(n_blocks):
+        state[:n_lanes] ^= blocks[j * n_lanes:(j + 1) * n_lanes]
+        _permute(state)
+
+    out = []
+    produced = 0
+    while True:
+        out.append(np.ascontiguousarray(state[:n_lanes].T, dtype='<u8').view(np.uint8))
+        produced += rate_bytes
+        if produced >= output_bytes:
+            return np.concatenate(out, axis=1)[:, :output_bytes]
+        _permute(state)
+
+
+def keccak_batch(messages, rate_bytes, output_bytes, suffix=0x06):
+    """
+    Hache N messages à la fois. Les messages sont regroupés selon leur nombre de blocs après padding :
+    chaque groupe est absorbé en parallèle (par lots d'au plus `BATCH_MESSAGES` messages), les états
+    étant un tableau uint64 (25, N).
+
+    :param messages: Suite de messages (bytes).
+    :param rate_bytes: Taille du bloc absorbé, en octets.
+    :param output_bytes: Taille de la sortie, en octets.
+    :param suffix: Bits de séparation de domaine (0x06 pour SHA-3, 0x1f pour SHAKE).
+    :return: Tableau uint8 (N, output_bytes), dans l'ordre des messages.
+    """
+    messages = [bytes(m) for m in messages]
+    result = np.empty((len(messages), output_bytes), dtype=np.uint8)
+    buckets = {}
+    for index, message in enumerate(messages):
+        buckets.setdefault(len(message) // rate_bytes + 1, []).append(index)
+    for n_blocks, indices in buckets.items():
+        for start in range(0, len(indices), BATCH_MESSAGES):
+            batch = indices[start:start + BATCH_MESSAGES]
+            result[batch] = _hash_bucket([messages[i] for i in batch], n_blocks, rate_bytes, output_bytes, suffix)
+    return result
+
+
+def sha3_batch(messages, digest_size=32):
+    """
+    :param messages: Suite de messages (bytes).
+    :param digest_size: Taille du condensat en octets (28, 32, 48 ou 64).
+    :return: Tableau uint8 (N, digest_size) des condensats SHA-3.
+    """
+    if digest_size not in (28, 32, 48, 64):
+        raise ValueError("SHA-3 est défini pour des condensats de 224, 256, 384 ou 512 bits.")
+    return keccak_batch(messages, 200 - 2 * digest_size, digest_size)
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation : 100 000 messages courts de longueurs variables.
+    import hashlib
+    import os
+    import time
+    from keccak import sha3_256
+
+    messages = [os.urandom(length) for length in np.random.randint(0, 300, size=100000)]
+    start = time.perf_counter()
+    digests = sha3_batch(messages, 32)
+    batch_time = time.perf_counter() - start
+    assert all(digests[i].tobytes() == hashlib.sha3_256(messages[i]).digest() for i in range(len(messages)))
+
+    start = time.perf_counter()
+    for message in messages[:2000]:
+        sha3_256(message).digest()
+    single_time = (time.perf_counter() - start) * len(messages) / 2000
+    print(f"{len(messages)} messages : lot {batch_time:.2f} s, un par un (estimé) {single_time:.2f} s")
+
+    shake = keccak_batch(messages[:10], 168, 400, suffix=0x1f)
+    assert all(shake[i].tobytes() == hashlib.shake_128(messages[i]).digest(400) for i in range(10))
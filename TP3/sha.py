@@ -166,31 +166,32 @@ def find_hash_with_leading_zeros(base_message, rate_bits, output_bits, leading_z
         counter += 1  
 
 
-# Définir les paramètres de la fonction de hachage
-rate_bits = 1152  
-output_bits = 224
-
-# Définir deux messages différents
-message1 = b"Hello, world!"
-message2 = b"Hello, world?!"
-
-# Calculer le hachage pour le premier message
-hash_output1 = sha3_keccak(message1, rate_bits, output_bits)
-hash_hex1 = hash_output1.hex()
-
-# Calculer le hachage pour le second message
-hash_output2 = sha3_keccak(message2, rate_bits, output_bits)
-hash_hex2 = hash_output2.hex()
-
-# Afficher les résultats
-print("Message 1:", message1)
-print("SHA-3-224 Hash 1:", hash_hex1)
-print("Message 2:", message2)
-print("SHA-3-224 Hash 2:", hash_hex2)
-
-
-base_message = b"Example message!"
-leading_zeros = 5
-found_message, found_hash = find_hash_with_leading_zeros(base_message, rate_bits, output_bits, leading_zeros)
-print(f"Found message: {found_message.decode()}")
-print(f"SHA-3 Hash with leading zeros: {found_hash}")
+if __name__ == "__main__":
+    # Définir les paramètres de la fonction de hachage
+    rate_bits = 1152  
+    output_bits = 224
+
+    # Définir deux messages différents
+    message1 = b"Hello, world!"
+    message2 = b"Hello, world?!"
+
+    # Calculer le hachage pour le premier message
+    hash_output1 = sha3_keccak(message1, rate_bits, output_bits)
+    hash_hex1 = hash_output1.hex()
+
+    # Calculer le hachage pour le second message
+    hash_output2 = sha3_keccak(message2, rate_bits, output_bits)
+    hash_hex2 = hash_output2.hex()
+
+    # Afficher les résultats
+    print("Message 1:", message1)
+    print("SHA-3-224 Hash 1:", hash_hex1)
+    print("Message 2:", message2)
+    print("SHA-3-224 Hash 2:", hash_hex2)
+
+
+    base_message = b"Example message!"
+    leading_zeros = 5
+    found_message, found_hash = find_hash_with_leading_zeros(base_message, rate_bits, output_bits, leading_zeros)
+    print(f"Found message: {found_message.decode()}")
+    print(f"SHA-3 Hash with leading zeros: {found_hash}")